@@ -0,0 +1,297 @@
+"""
+Synthetic invoice corpus and extraction benchmark.
+
+`generate` writes N synthetic invoice PDFs (two layouts, several vendors,
+varying page counts) with a ground-truth JSON file next to each one. The PDFs
+are written directly, so no network access or extra packages are needed.
+
+`run` extracts every PDF in a corpus and reports docs/sec, pages/sec, time
+per stage and per-field accuracy against the ground truth.
+
+Usage:
+    python benchmark.py generate corpus/ -n 500 --seed 1
+    python benchmark.py run corpus/ --mode all
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+from datetime import date, timedelta
+
+from main import (HEADERS, NUMERIC_FIELDS, clean_extracted_text, extract_invoice_details,
+                  extract_text_from_pdf, parse_invoice_details)
+from templates import scan_invoice
+
+VENDORS = ['Northwind Traders', 'Globex Supply', 'Initech Services', 'Umbrella Logistics', 'Stark Hardware']
+CUSTOMERS = ['Acme Corp', 'Wayne Enterprises', 'Hooli Inc', 'Vandelay Industries', 'Soylent Foods']
+STREETS = ['Main St', 'Oak Ave', 'Market St', 'Elm Rd', 'Harbor Blvd']
+CITIES = ['Pittsburgh, PA 15222', 'Austin, TX 78701', 'Denver, CO 80202', 'Seattle, WA 98101']
+ITEMS = ['Consulting hours', 'Widget assembly', 'Freight charge', 'Support plan', 'Replacement parts',
+         'Installation', 'License renewal', 'Training session']
+LAYOUTS = ['standard', 'invoice-hash']
+
+LINES_PER_PAGE = 48
+
+
+# ---------------------- Minimal PDF writer ----------------------
+
+def _pdf_escape(line):
+    return line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def write_pdf(path, pages):
+    """
+    Write a PDF with one Helvetica text page per list of lines in `pages`.
+    """
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # page tree, filled in once the page object numbers are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+    ]
+    page_refs = []
+    for lines in pages:
+        text = "".join(f"({_pdf_escape(line)}) Tj T*\n" for line in lines)
+        stream = f"BT /F1 10 Tf 14 TL 50 780 Td\n{text}ET".encode('latin-1')
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(None)
+        page_number = len(objects)
+        page_refs.append(page_number)
+        objects[page_number - 1] = (
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % (page_number - 1)
+        )
+    kids = b" ".join(b"%d 0 R" % n for n in page_refs)
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_refs))
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+
+    with open(path, 'wb') as f:
+        f.write(out)
+
+
+# ---------------------- Corpus generation ----------------------
+
+def _long_date(d):
+    return f"{d.strftime('%B')} {d.day}, {d.year}"
+
+
+def _short_date(d):
+    return f"{d.month:02d}/{d.day:02d}/{d.year}"
+
+
+def make_invoice(rng, index):
+    """
+    Return (pages, truth) for one synthetic invoice.
+    """
+    layout = rng.choice(LAYOUTS)
+    vendor = rng.choice(VENDORS)
+    customer = rng.choice(CUSTOMERS)
+    address = f"{rng.randint(10, 9999)} {rng.choice(STREETS)} {rng.choice(CITIES)}"
+    number = f"{vendor[:3].upper()}-{index:06d}"
+    issued = date(2024, 1, 1) + timedelta(days=rng.randint(0, 364))
+    due = issued + timedelta(days=rng.choice([15, 30, 45]))
+
+    # Page count is driven by the number of line items; most invoices are short
+    n_items = rng.choice([1, 2, 3, 5, 8, 12]) if rng.random() < 0.8 else rng.randint(40, 200)
+    items = []
+    for _ in range(n_items):
+        qty = rng.randint(1, 5)
+        price = round(rng.uniform(5, 400), 2)
+        items.append((rng.choice(ITEMS), qty, price, round(qty * price, 2)))
+    subtotal = round(sum(item[3] for item in items), 2)
+    tax_rate = rng.choice([0, 6, 7, 8.25])
+    tax = round(subtotal * tax_rate / 100, 2)
+    total = round(subtotal + tax, 2)
+
+    if layout == 'standard':
+        header = ["Invoice", f"Invoice number {number}", f"Date of issue {_long_date(issued)}",
+                  f"Date due {_long_date(due)}", vendor, "Bill to", customer, address,
+                  "Description Qty Unit price Amount"]
+        footer = [f"Subtotal ${subtotal:,.2f}", f"Tax ({tax_rate}%) ${tax:,.2f}",
+                  f"Total ${total:,.2f}", f"Amount due ${total:,.2f}"]
+        issued_text, due_text = _long_date(issued), _long_date(due)
+    else:
+        header = [vendor, f"Invoice #: {number}", f"Invoice Date: {_short_date(issued)}",
+                  f"Due Date: {_short_date(due)}", f"Bill To: {customer}", address,
+                  "Description Qty Rate Amount"]
+        footer = [f"Subtotal: ${subtotal:,.2f}", f"Sales Tax ({tax_rate}%): ${tax:,.2f}",
+                  f"Total: ${total:,.2f}", f"Balance Due: ${total:,.2f}"]
+        issued_text, due_text = _short_date(issued), _short_date(due)
+
+    lines = header + [f"{name} {qty} ${price:,.2f} ${amount:,.2f}" for name, qty, price, amount in items] + footer
+    pages = [lines[i:i + LINES_PER_PAGE] for i in range(0, len(lines), LINES_PER_PAGE)]
+
+    truth = {
+        'Invoice Number': number,
+        'Date of Issue': issued_text,
+        'Date Due': due_text,
+        'Bill To': f"{customer} {address}",
+        'Subtotal': subtotal,
+        'Tax': tax,
+        'Total': total,
+        'Amount Due': total,
+        'layout': layout,
+        'vendor': vendor,
+        'pages': len(pages),
+    }
+    return pages, truth
+
+
+def generate_corpus(directory, count, seed=0):
+    os.makedirs(directory, exist_ok=True)
+    rng = random.Random(seed)
+    for index in range(count):
+        pages, truth = make_invoice(rng, index)
+        base = os.path.join(directory, f"invoice_{index:06d}")
+        write_pdf(base + '.pdf', pages)
+        with open(base + '.json', 'w') as f:
+            json.dump(truth, f, indent=2)
+
+
+# ---------------------- Benchmark ----------------------
+
+def _matches(expected, actual):
+    if actual == "N/A":
+        return False
+    if isinstance(expected, float):
+        return isinstance(actual, float) and abs(expected - actual) < 0.005
+    return ' '.join(str(actual).split()).lower() == ' '.join(str(expected).split()).lower()
+
+
+def _baseline(pdf_path, timings):
+    start = time.perf_counter()
+    raw_text = extract_text_from_pdf(pdf_path)
+    t_extract = time.perf_counter()
+    cleaned_text = clean_extracted_text(raw_text)
+    t_clean = time.perf_counter()
+    details = parse_invoice_details(cleaned_text)
+    t_parse = time.perf_counter()
+    timings['extract'] += t_extract - start
+    timings['clean'] += t_clean - t_extract
+    timings['parse'] += t_parse - t_clean
+    return details
+
+
+def _early_exit(pdf_path, timings):
+    start = time.perf_counter()
+    details = extract_invoice_details(pdf_path)
+    timings['extract+parse'] += time.perf_counter() - start
+    return details
+
+
+def _templates(pdf_path, timings):
+    start = time.perf_counter()
+    raw_text = extract_text_from_pdf(pdf_path)
+    t_extract = time.perf_counter()
+    cleaned_text = clean_extracted_text(raw_text)
+    t_clean = time.perf_counter()
+    details, _ = scan_invoice(cleaned_text)
+    t_parse = time.perf_counter()
+    timings['extract'] += t_extract - start
+    timings['clean'] += t_clean - t_extract
+    timings['parse'] += t_parse - t_clean
+    return details
+
+
+MODES = {
+    'baseline': _baseline,
+    'early-exit': _early_exit,
+    'templates': _templates,
+}
+
+
+def run_benchmark(directory, mode='baseline', limit=None):
+    pdf_paths = sorted(os.path.join(directory, f) for f in os.listdir(directory) if f.endswith('.pdf'))[:limit]
+    extract = MODES[mode]
+    timings = {'extract+parse': 0.0} if mode == 'early-exit' else {'extract': 0.0, 'clean': 0.0, 'parse': 0.0}
+    correct = {key: 0 for key in HEADERS}
+    pages = 0
+    failed = 0
+
+    start = time.perf_counter()
+    for pdf_path in pdf_paths:
+        with open(pdf_path[:-4] + '.json') as f:
+            truth = json.load(f)
+        pages += truth['pages']
+        try:
+            details = extract(pdf_path, timings)
+        except Exception as e:
+            print(f"Error processing {pdf_path}: {e}")
+            failed += 1
+            continue
+        for key in HEADERS:
+            expected = truth[key]
+            if key in NUMERIC_FIELDS:
+                expected = float(expected)
+            if _matches(expected, details.get(key, "N/A")):
+                correct[key] += 1
+    wall = time.perf_counter() - start
+
+    docs = len(pdf_paths)
+    return {
+        'mode': mode,
+        'docs': docs,
+        'pages': pages,
+        'failed': failed,
+        'seconds': wall,
+        'docs_per_sec': docs / wall if wall else 0.0,
+        'pages_per_sec': pages / wall if wall else 0.0,
+        'stage_seconds': timings,
+        'accuracy': {key: correct[key] / docs if docs else 0.0 for key in HEADERS},
+    }
+
+
+def print_report(result):
+    print(f"\n== {result['mode']} ==")
+    print(f"{result['docs']} docs, {result['pages']} pages, {result['failed']} failed in {result['seconds']:.2f}s")
+    print(f"{result['docs_per_sec']:.1f} docs/s, {result['pages_per_sec']:.1f} pages/s")
+    for stage, seconds in result['stage_seconds'].items():
+        per_doc = seconds / result['docs'] * 1000 if result['docs'] else 0.0
+        print(f"  {stage:<14} {seconds:8.2f}s  {per_doc:7.2f} ms/doc")
+    print("Field accuracy:")
+    for key, accuracy in result['accuracy'].items():
+        print(f"  {key:<14} {accuracy:6.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Synthetic invoice corpus and extraction benchmark.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    gen = subparsers.add_parser('generate', help="Write synthetic invoice PDFs with ground-truth JSON.")
+    gen.add_argument("directory")
+    gen.add_argument("-n", "--count", type=int, default=200, help="Number of invoices to generate.")
+    gen.add_argument("--seed", type=int, default=0, help="Random seed (same seed, same corpus).")
+
+    run = subparsers.add_parser('run', help="Benchmark extraction over a generated corpus.")
+    run.add_argument("directory")
+    run.add_argument("--mode", choices=list(MODES) + ['all'], default='baseline')
+    run.add_argument("--limit", type=int, default=None, help="Only use the first N PDFs.")
+    run.add_argument("--json", dest='json_path', default=None, help="Also write the results to this JSON file.")
+
+    args = parser.parse_args()
+    if args.command == 'generate':
+        generate_corpus(args.directory, args.count, args.seed)
+        print(f"Wrote {args.count} invoices to {args.directory}")
+        return
+
+    modes = list(MODES) if args.mode == 'all' else [args.mode]
+    results = [run_benchmark(args.directory, mode, args.limit) for mode in modes]
+    for result in results:
+        print_report(result)
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
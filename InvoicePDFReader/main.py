@@ -1,70 +1,164 @@
 import os
 import re
+from contextlib import closing
 import openpyxl
 from openpyxl.styles import Alignment
 from PyPDF2 import PdfReader
 import pdfplumber
 
+# Improved regex patterns for extraction, compiled once at import
+FIELD_PATTERNS = {
+    key: re.compile(pattern, re.IGNORECASE | re.DOTALL)
+    for key, pattern in {
+        'Invoice Number': r'Invoice\s*number\s*([A-Za-z0-9-]+)',
+        'Date of Issue': r'Date\s*of\s*issue\s*([A-Za-z]+\s+\d{1,2},\s+\d{4})',
+        'Date Due': r'Date\s*due\s*([A-Za-z]+\s+\d{1,2},\s+\d{4})',
+        'Bill To': r'Bill\s*to\s*(.*?)(?=\$|Subtotal|$)',
+        'Subtotal': r'Subtotal\s*\$?\s*([0-9.]+)',
+        'Tax': r'Tax\s*.*?\$\s*([0-9.]+)',
+        'Total': r'Total\s*\$?\s*([0-9.]+)',
+        'Amount Due': r'Amount\s*due\s*\$?\s*([0-9.]+)'
+    }.items()
+}
+NUMERIC_FIELDS = {'Subtotal', 'Tax', 'Total', 'Amount Due'}
+
+# Output columns, in order
+HEADERS = ['Invoice Number', 'Date of Issue', 'Date Due', 'Bill To', 'Subtotal', 'Tax', 'Total', 'Amount Due']
+
+# Fields that must be found before early-exit extraction stops reading pages
+REQUIRED_FIELDS = ('Invoice Number', 'Date of Issue', 'Date Due', 'Subtotal', 'Total', 'Amount Due')
+
+# Text carried over from the previous page when searching a new one; longer
+# than any field match expected to straddle a page break
+CARRY_OVER = 1000
+
 def extract_text_from_pdf(pdf_path):
     # Use pdfplumber for more robust text extraction
     with pdfplumber.open(pdf_path) as pdf:
-        text = ""
-        for page in pdf.pages:
-            text += page.extract_text() or ""
+        text = "".join(page.extract_text() or "" for page in pdf.pages)
     return text
 
+def iter_page_texts(pdf_path, fast=True):
+    # Yield page texts lazily. With fast=True the PDF text layer is read with
+    # PyPDF2 and pdfplumber's layout analysis is only used for pages where
+    # that comes back empty.
+    reader = None
+    if fast:
+        try:
+            reader = PdfReader(pdf_path)
+        except Exception:
+            reader = None
+
+    if reader is None:
+        with pdfplumber.open(pdf_path) as pdf:
+            for page in pdf.pages:
+                yield page.extract_text() or ""
+        return
+
+    plumber = None
+    try:
+        for index, page in enumerate(reader.pages):
+            try:
+                text = page.extract_text() or ""
+            except Exception:
+                text = ""
+            if not text.strip():
+                if plumber is None:
+                    plumber = pdfplumber.open(pdf_path)
+                text = plumber.pages[index].extract_text() or ""
+            yield text
+    finally:
+        if plumber is not None:
+            plumber.close()
+
 def clean_extracted_text(text):
     # More aggressive text cleaning
     # Remove newlines, extra spaces, and normalize
     cleaned_text = re.sub(r'\s+', ' ', text).strip()
     return cleaned_text
 
+def field_value(key, match):
+    if key in NUMERIC_FIELDS:
+        return float(match.group(1))
+    return match.group(1).strip()
+
 def parse_invoice_details(text):
     details = {}
 
-    # Improved regex patterns for extraction
-    patterns = {
-        'Invoice Number': r'Invoice\s*number\s*([A-Za-z0-9-]+)',
-        'Date of Issue': r'Date\s*of\s*issue\s*([A-Za-z]+\s+\d{1,2},\s+\d{4})',
-        'Date Due': r'Date\s*due\s*([A-Za-z]+\s+\d{1,2},\s+\d{4})',
-        'Bill To': r'Bill\s*to\s*(.*?)(?=\$|Subtotal|$)',
-        'Subtotal': r'Subtotal\s*\$?\s*([0-9.]+)',
-        'Tax': r'Tax\s*.*?\$\s*([0-9.]+)',
-        'Total': r'Total\s*\$?\s*([0-9.]+)',
-        'Amount Due': r'Amount\s*due\s*\$?\s*([0-9.]+)'
-    }
-
     # Extract details with more flexible matching
-    for key, pattern in patterns.items():
-        match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
+    for key, pattern in FIELD_PATTERNS.items():
+        match = pattern.search(text)
         if match:
-            if key in ['Subtotal', 'Tax', 'Total', 'Amount Due']:
-                details[key] = float(match.group(1))
-            else:
-                details[key] = match.group(1).strip()
+            details[key] = field_value(key, match)
         else:
             details[key] = "N/A"
 
     return details
 
+def extract_invoice_details(pdf_path, required_fields=REQUIRED_FIELDS, fast=True):
+    # Read pages one at a time and stop as soon as every required field is
+    # found, so a long statement costs about as much as its first page.
+    # Each page is searched together with the tail of the text before it
+    # (CARRY_OVER characters), which catches values split by a page break
+    # without rescanning everything read so far. A match touching the end of
+    # that window could still grow with the next page, so it is only
+    # accepted once more text follows it; fields never found in a window
+    # get one search over the whole text at the end.
+    details = {key: "N/A" for key in FIELD_PATTERNS}
+    missing = set(FIELD_PATTERNS)
+    parts = []
+    tail = ""
+
+    with closing(iter_page_texts(pdf_path, fast)) as pages:
+        for page_text in pages:
+            page = clean_extracted_text(page_text)
+            parts.append(page)
+            window = page if len(parts) == 1 else f"{tail} {page}"
+            for key in list(missing):
+                match = FIELD_PATTERNS[key].search(window)
+                if match and match.end() < len(window):
+                    details[key] = field_value(key, match)
+                    missing.discard(key)
+            if missing.isdisjoint(required_fields):
+                return details
+            tail = window[-CARRY_OVER:]
+
+    if missing:
+        text = ' '.join(parts)
+        for key in missing:
+            match = FIELD_PATTERNS[key].search(text)
+            if match:
+                details[key] = field_value(key, match)
+    return details
+
 def write_to_excel(details_list, output_path):
     wb = openpyxl.Workbook()
     ws = wb.active
     ws.title = "Invoice Details"
 
-    headers = ['Invoice Number', 'Date of Issue', 'Date Due', 'Bill To', 'Subtotal', 'Tax', 'Total', 'Amount Due']
-    for col_num, header in enumerate(headers, start=1):
+    for col_num, header in enumerate(HEADERS, start=1):
         cell = ws.cell(row=1, column=col_num, value=header)
         cell.alignment = Alignment(horizontal='center', vertical='center')
         cell.font = openpyxl.styles.Font(bold=True)
 
     for row_num, details in enumerate(details_list, start=2):
-        for col_num, key in enumerate(headers, start=1):
+        for col_num, key in enumerate(HEADERS, start=1):
             value = details.get(key, "N/A")
             ws.cell(row=row_num, column=col_num, value=value)
 
     wb.save(output_path)
 
+def process_pdf(pdf_path, early_exit=False):
+    if early_exit:
+        return extract_invoice_details(pdf_path)
+
+    # Extract raw text
+    raw_text = extract_text_from_pdf(pdf_path)
+    cleaned_text = clean_extracted_text(raw_text)
+
+    # Parse details
+    return parse_invoice_details(cleaned_text)
+
 def process_pdfs_in_directory(directory, output_excel_path):
     details_list = []
     for file_name in os.listdir(directory):
@@ -73,12 +167,7 @@ def process_pdfs_in_directory(directory, output_excel_path):
             print(f"Processing {pdf_path}...")
             
             try:
-                # Extract raw text
-                raw_text = extract_text_from_pdf(pdf_path)
-                cleaned_text = clean_extracted_text(raw_text)
-                
-                # Parse details
-                details = parse_invoice_details(cleaned_text)
+                details = process_pdf(pdf_path)
                 print(f"Parsed details from {file_name}: {details}\n{'-'*50}")
                 
                 details_list.append(details)
@@ -90,11 +179,12 @@ def process_pdfs_in_directory(directory, output_excel_path):
 # Ensure required libraries are installed
 # pip install openpyxl PyPDF2 pdfplumber
 
-# Define paths
-repository_path = '/Users/joshuabrooks/PythonProjectsPrivate-6/InvoicePDFReader'
-output_excel_path = os.path.join(repository_path, 'Invoice_Details.xlsx')
+if __name__ == "__main__":
+    # Define paths
+    repository_path = '/Users/joshuabrooks/PythonProjectsPrivate-6/InvoicePDFReader'
+    output_excel_path = os.path.join(repository_path, 'Invoice_Details.xlsx')
 
-# Process all PDF files in the directory
-process_pdfs_in_directory(repository_path, output_excel_path)
+    # Process all PDF files in the directory
+    process_pdfs_in_directory(repository_path, output_excel_path)
 
-print(f"Invoice details have been written to {output_excel_path}")
\ No newline at end of file
+    print(f"Invoice details have been written to {output_excel_path}")
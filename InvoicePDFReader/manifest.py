@@ -0,0 +1,209 @@
+"""
+Incremental invoice ingestion.
+
+Keeps a SQLite manifest of every PDF under a directory tree (path, size,
+mtime, SHA-256 of the content, parsed details). A run only extracts PDFs
+that are new or whose content changed, then regenerates the output workbook
+from the stored results. With --watch it keeps polling the directory and
+picks up new files as they land.
+
+Usage:
+    python manifest.py /path/to/pdfs --workers 8
+    python manifest.py /path/to/pdfs --watch --interval 10
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+from main import HEADERS
+from pipeline import ProgressReporter, iter_parallel_results
+from templates import build_template_set
+from writers import open_writer
+
+MANIFEST_NAME = '.invoice_manifest.sqlite'
+
+# Files modified more recently than this are assumed to still be copying in
+SETTLE_SECONDS = 2.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sha256 TEXT NOT NULL,
+    details TEXT,
+    error TEXT,
+    processed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS files_sha256 ON files (sha256);
+"""
+
+
+def walk_pdfs(directory):
+    """
+    Recursively yield (path, size, mtime_ns) for every PDF under directory.
+    """
+    stack = [directory]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file() and entry.name.lower().endswith('.pdf'):
+                    st = entry.stat()
+                    yield entry.path, st.st_size, st.st_mtime_ns
+
+
+def file_sha256(path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class InvoiceManifest:
+    def __init__(self, db_path):
+        self.conn = sqlite3.connect(db_path)
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def plan(self, directory, settle=SETTLE_SECONDS):
+        """
+        Compare the directory with the manifest. Unchanged files are skipped on
+        size + mtime alone; only files whose stat changed are hashed. Returns
+        (pending, copied, removed): pending maps path -> (size, mtime_ns, sha256)
+        for files that need extracting, copied lists files whose results were
+        reused from an identical file, removed lists paths no longer on disk.
+        """
+        known = {path: (size, mtime_ns, sha256)
+                 for path, size, mtime_ns, sha256 in self.conn.execute("SELECT path, size, mtime_ns, sha256 FROM files")}
+        now_ns = time.time_ns()
+        seen = set()
+        pending = {}
+        copied = []
+
+        for path, size, mtime_ns in walk_pdfs(directory):
+            seen.add(path)
+            row = known.get(path)
+            if row and row[0] == size and row[1] == mtime_ns:
+                continue
+            if now_ns - mtime_ns < settle * 1e9:
+                continue
+            sha256 = file_sha256(path)
+            if row and row[2] == sha256:
+                # Touched but not changed: just refresh the stat fields
+                self.conn.execute("UPDATE files SET size = ?, mtime_ns = ? WHERE path = ?", (size, mtime_ns, path))
+                continue
+            if self._copy_from_duplicate(path, size, mtime_ns, sha256):
+                copied.append(path)
+                continue
+            pending[path] = (size, mtime_ns, sha256)
+
+        prefix = os.path.join(directory, '')
+        removed = [path for path in known if path not in seen and path.startswith(prefix)]
+        self.conn.executemany("DELETE FROM files WHERE path = ?", ((p,) for p in removed))
+        self.conn.commit()
+        return pending, copied, removed
+
+    def _copy_from_duplicate(self, path, size, mtime_ns, sha256):
+        # The same bytes were already parsed under another name
+        row = self.conn.execute(
+            "SELECT details, error FROM files WHERE sha256 = ? AND error IS NULL LIMIT 1", (sha256,)
+        ).fetchone()
+        if row is None:
+            return False
+        self.record(path, size, mtime_ns, sha256, row[0], None)
+        return True
+
+    def record(self, path, size, mtime_ns, sha256, details_json, error):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO files (path, size, mtime_ns, sha256, details, error, processed_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (path, size, mtime_ns, sha256, details_json, error, time.time()),
+        )
+
+    def iter_details(self, directory):
+        """
+        Yield the stored details of every successfully parsed file, ordered by path.
+        """
+        prefix = os.path.join(directory, '')
+        rows = self.conn.execute(
+            "SELECT path, details FROM files WHERE details IS NOT NULL AND substr(path, 1, ?) = ? ORDER BY path",
+            (len(prefix), prefix),
+        )
+        for path, details_json in rows:
+            yield json.loads(details_json)
+
+
+def sync_directory(manifest, directory, workers=None, chunksize=16, templates=None, commit_every=100):
+    """
+    Extract new/changed PDFs into the manifest. Returns the number of files
+    added, changed or removed.
+    """
+    pending, copied, removed = manifest.plan(directory)
+    if not pending:
+        return len(copied) + len(removed)
+
+    progress = ProgressReporter(len(pending))
+    results = iter_parallel_results(list(pending), workers, chunksize, ordered=False,
+                                    progress=progress, templates=templates)
+    for count, (pdf_path, details, error) in enumerate(results, start=1):
+        if error:
+            print(f"Error processing {pdf_path}: {error}")
+        size, mtime_ns, sha256 = pending[pdf_path]
+        manifest.record(pdf_path, size, mtime_ns, sha256,
+                        json.dumps(details) if details is not None else None, error)
+        if count % commit_every == 0:
+            manifest.conn.commit()
+    manifest.conn.commit()
+    print(progress.summary())
+    return len(pending) + len(copied) + len(removed)
+
+
+def write_output(manifest, directory, output_path, columns=HEADERS):
+    with open_writer(output_path, columns) as writer:
+        for details in manifest.iter_details(directory):
+            writer.write(details)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incrementally extract invoice details from a directory tree of PDFs.")
+    parser.add_argument("directory", help="Directory containing the invoice PDFs (searched recursively).")
+    parser.add_argument("--output", default=None, help="Output file, .xlsx, .csv or .parquet (default: <directory>/Invoice_Details.xlsx).")
+    parser.add_argument("--db", default=None, help=f"Manifest database (default: <directory>/{MANIFEST_NAME}).")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count).")
+    parser.add_argument("--templates", action="store_true", help="Parse with the vendor template scanner.")
+    parser.add_argument("--watch", action="store_true", help="Keep running and pick up new files.")
+    parser.add_argument("--interval", type=float, default=10.0, help="Seconds between directory scans in watch mode.")
+    args = parser.parse_args()
+
+    directory = os.path.abspath(args.directory)
+    output_excel_path = args.output or os.path.join(directory, 'Invoice_Details.xlsx')
+    templates = build_template_set() if args.templates else None
+    manifest = InvoiceManifest(args.db or os.path.join(directory, MANIFEST_NAME))
+
+    try:
+        while True:
+            changed = sync_directory(manifest, directory, args.workers, templates=templates)
+            if changed or not os.path.exists(output_excel_path):
+                columns = HEADERS + ['Template'] if templates is not None else HEADERS
+                write_output(manifest, directory, output_excel_path, columns)
+                print(f"Invoice details have been written to {output_excel_path} ({changed} files changed)")
+            if not args.watch:
+                break
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        manifest.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Parallel invoice extraction.
+
+Runs extract_text_from_pdf + parse_invoice_details in a pool of worker
+processes and streams the parsed results back to the caller as they finish,
+printing progress and throughput along the way.
+
+Usage:
+    python pipeline.py /path/to/pdfs --workers 8 --chunksize 16 --unordered
+"""
+
+import argparse
+import functools
+import multiprocessing
+import os
+import sys
+import time
+
+from main import HEADERS, process_pdf
+from templates import build_template_set, process_pdf_with_templates
+from writers import CRASH_SAFE, open_writer
+
+# Restart workers periodically; pdfplumber holds on to memory across documents
+MAX_TASKS_PER_CHILD = 500
+# Batches at least this big get a warning when written to a sink that is only saved at the end
+LARGE_RUN = 1000
+
+
+def find_pdfs(directory):
+    return sorted(
+        os.path.join(directory, file_name)
+        for file_name in os.listdir(directory)
+        if file_name.lower().endswith('.pdf')
+    )
+
+
+def _process_one(pdf_path, early_exit=False, templates=None):
+    # Runs in a worker: never raise, so one bad file does not kill the batch
+    start = time.perf_counter()
+    try:
+        if templates is not None:
+            details = process_pdf_with_templates(pdf_path, templates)
+        else:
+            details = process_pdf(pdf_path, early_exit)
+        error = None
+    except Exception as e:
+        details = None
+        error = f"{type(e).__name__}: {e}"
+    return pdf_path, details, error, time.perf_counter() - start
+
+
+class ProgressReporter:
+    """
+    Prints done/total, docs/sec and ETA at most once every `interval` seconds.
+    """
+
+    def __init__(self, total, interval=2.0, stream=sys.stderr):
+        self.total = total
+        self.interval = interval
+        self.stream = stream
+        self.done = 0
+        self.failed = 0
+        self.worker_seconds = 0.0
+        self.started = time.perf_counter()
+        self._last_report = self.started
+
+    def update(self, error, elapsed):
+        self.done += 1
+        self.worker_seconds += elapsed
+        if error:
+            self.failed += 1
+        now = time.perf_counter()
+        if now - self._last_report >= self.interval or self.done == self.total:
+            self._last_report = now
+            self.report(now)
+
+    def report(self, now=None):
+        wall = (now or time.perf_counter()) - self.started
+        rate = self.done / wall if wall > 0 else 0.0
+        eta = (self.total - self.done) / rate if rate > 0 else float('inf')
+        print(f"[{self.done}/{self.total}] {rate:.1f} docs/s, "
+              f"{self.failed} failed, ETA {eta:.0f}s", file=self.stream)
+
+    def summary(self):
+        wall = time.perf_counter() - self.started
+        rate = self.done / wall if wall > 0 else 0.0
+        avg = self.worker_seconds / self.done if self.done else 0.0
+        return (f"Processed {self.done} PDFs ({self.failed} failed) in {wall:.1f}s: "
+                f"{rate:.1f} docs/s, {avg * 1000:.0f} ms/doc in workers")
+
+
+def iter_parallel_results(pdf_paths, workers=None, chunksize=16, ordered=True, progress=None, early_exit=False,
+                          templates=None):
+    """
+    Process pdf_paths in a process pool, yielding (pdf_path, details, error)
+    as results arrive. With ordered=False results are yielded in completion
+    order, which keeps a slow document from holding back the rest.
+    Passing a TemplateSet switches parsing to the single-pass template scanner.
+    """
+    workers = workers or os.cpu_count() or 1
+    task = functools.partial(_process_one, early_exit=early_exit, templates=templates)
+
+    if workers == 1:
+        results = map(task, pdf_paths)
+        for pdf_path, details, error, elapsed in results:
+            if progress:
+                progress.update(error, elapsed)
+            yield pdf_path, details, error
+        return
+
+    with multiprocessing.Pool(workers, maxtasksperchild=MAX_TASKS_PER_CHILD) as pool:
+        imap = pool.imap if ordered else pool.imap_unordered
+        for pdf_path, details, error, elapsed in imap(task, pdf_paths, chunksize=chunksize):
+            if progress:
+                progress.update(error, elapsed)
+            yield pdf_path, details, error
+
+
+def process_pdfs_in_directory_parallel(directory, output_excel_path, workers=None, chunksize=16, ordered=True,
+                                       early_exit=False, templates=None):
+    pdf_paths = find_pdfs(directory)
+    progress = ProgressReporter(len(pdf_paths))
+    columns = HEADERS + ['Template'] if templates is not None else HEADERS
+
+    if len(pdf_paths) >= LARGE_RUN and not output_excel_path.lower().endswith(CRASH_SAFE):
+        print(f"Warning: {os.path.basename(output_excel_path)} is only written when all {len(pdf_paths)} PDFs "
+              f"are done, so a crash loses the run; use a .csv output for large batches.")
+
+    # Rows go to the writer as they arrive; nothing is held for the whole batch
+    with open_writer(output_excel_path, columns) as writer:
+        results = iter_parallel_results(pdf_paths, workers, chunksize, ordered, progress, early_exit, templates)
+        for pdf_path, details, error in results:
+            if error:
+                print(f"Error processing {os.path.basename(pdf_path)}: {error}")
+            else:
+                writer.write(details)
+    print(progress.summary())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract invoice details from a directory of PDFs in parallel.")
+    parser.add_argument("directory", help="Directory containing the invoice PDFs.")
+    parser.add_argument("--output", default=None, help="Output file, .csv, .parquet or .xlsx (default: <directory>/Invoice_Details.csv).")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count).")
+    parser.add_argument("--chunksize", type=int, default=16, help="PDFs handed to a worker per task.")
+    parser.add_argument("--unordered", action="store_true", help="Write results in completion order.")
+    parsing = parser.add_mutually_exclusive_group()
+    parsing.add_argument("--early-exit", action="store_true",
+                         help="Stop reading a PDF once the required fields are found (PyPDF2 text layer first).")
+    parsing.add_argument("--templates", action="store_true",
+                         help="Parse with the single-pass vendor template scanner.")
+    parser.add_argument("--template-file", default=None,
+                        help="JSON file with extra vendor templates (implies --templates).")
+    args = parser.parse_args()
+
+    templates = None
+    if args.templates or args.template_file:
+        if args.early_exit:
+            parser.error("--template-file cannot be combined with --early-exit")
+        templates = build_template_set(args.template_file)
+
+    # CSV by default: it is flushed as rows arrive, so an interrupted run keeps its results
+    output_excel_path = args.output or os.path.join(args.directory, 'Invoice_Details.csv')
+    process_pdfs_in_directory_parallel(args.directory, output_excel_path, args.workers,
+                                       args.chunksize, not args.unordered, args.early_exit, templates)
+    print(f"Invoice details have been written to {output_excel_path}")
+
+
+if __name__ == "__main__":
+    main()
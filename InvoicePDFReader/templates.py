@@ -0,0 +1,154 @@
+"""
+Single-pass invoice field extraction with per-vendor templates.
+
+Each template's field patterns are compiled once into a single alternation of
+named groups, so every field is found in one finditer() pass over the text
+instead of one re.search() per field. The template is picked from a cheap
+fingerprint of the document header (marker strings that must all appear in
+the first few hundred characters), so adding vendor layouts does not slow
+down scanning.
+
+Custom layouts can be loaded from a JSON file:
+    [{"name": "acme", "markers": ["acme corp", "invoice #"],
+      "patterns": {"Invoice Number": "Invoice\\s*#\\s*(?P<value>[A-Z0-9-]+)", ...}}]
+Every pattern must contain exactly one capturing group, named "value".
+"""
+
+import json
+import re
+
+from main import HEADERS as FIELDS, NUMERIC_FIELDS, clean_extracted_text, extract_text_from_pdf
+
+# Characters of the cleaned text used to fingerprint the layout
+HEADER_SIZE = 512
+
+_DATE = r'[A-Za-z]+\s+\d{1,2},\s+\d{4}|\d{1,2}/\d{1,2}/\d{4}'
+_AMOUNT = r'[0-9][0-9,]*(?:\.[0-9]+)?'
+
+# The layout parse_invoice_details() was written for. "Bill To" and "Tax"
+# have bounded spans so a missing terminator cannot scan to the end of the text.
+STANDARD_PATTERNS = {
+    'Invoice Number': r'Invoice\s*number\s*(?P<value>[A-Za-z0-9-]+)',
+    'Date of Issue': r'Date\s*of\s*issue\s*(?P<value>' + _DATE + r')',
+    'Date Due': r'Date\s*due\s*(?P<value>' + _DATE + r')',
+    'Bill To': r'Bill\s*to\s*(?P<value>.{0,300}?)(?=\$|Description|Subtotal|Invoice\s*number|Date\s*(?:of\s*issue|due)|$)',
+    'Subtotal': r'Subtotal\s*\$?\s*(?P<value>' + _AMOUNT + r')',
+    'Tax': r'Tax\s*[^$]{0,40}\$\s*(?P<value>' + _AMOUNT + r')',
+    'Total': r'Total\s*\$?\s*(?P<value>' + _AMOUNT + r')',
+    'Amount Due': r'Amount\s*due\s*\$?\s*(?P<value>' + _AMOUNT + r')',
+}
+
+# "Invoice #: ... Invoice Date: ... Due Date: ... Balance Due:" layouts
+HASH_PATTERNS = {
+    'Invoice Number': r'Invoice\s*#\s*:?\s*(?P<value>[A-Za-z0-9-]+)',
+    'Date of Issue': r'Invoice\s*date\s*:?\s*(?P<value>' + _DATE + r')',
+    'Date Due': r'Due\s*date\s*:?\s*(?P<value>' + _DATE + r')',
+    'Bill To': r'Bill\s*to\s*:?\s*(?P<value>.{0,300}?)(?=Invoice\s*(?:#|date)|Due\s*date|Description|Subtotal|$)',
+    'Subtotal': r'Subtotal\s*:?\s*\$?\s*(?P<value>' + _AMOUNT + r')',
+    'Tax': r'(?:Sales\s*)?Tax\s*(?:\([^)]{0,20}\))?\s*:?\s*\$?\s*(?P<value>' + _AMOUNT + r')',
+    'Total': r'Total\s*:?\s*\$?\s*(?P<value>' + _AMOUNT + r')',
+    'Amount Due': r'Balance\s*due\s*:?\s*\$?\s*(?P<value>' + _AMOUNT + r')',
+}
+
+
+class InvoiceTemplate:
+    """
+    A vendor layout: header markers plus one pattern per field, compiled
+    into a single scanner.
+    """
+
+    def __init__(self, name, patterns, markers=()):
+        self.name = name
+        self.markers = tuple(m.lower() for m in markers)
+        self.fields = [key for key in FIELDS if key in patterns]
+
+        alternatives = []
+        for index, key in enumerate(self.fields):
+            pattern = patterns[key]
+            compiled = re.compile(pattern)
+            if compiled.groups != 1 or compiled.groupindex.get('value') != 1:
+                raise ValueError(f"Template '{name}', field '{key}': pattern needs exactly one group named 'value'")
+            alternatives.append(pattern.replace('(?P<value>', f'(?P<f{index}>'))
+        # Order matters: at a given position the first alternative wins, so
+        # "Subtotal" is consumed before "Total" can match inside it.
+        self.scanner = re.compile('|'.join(alternatives), re.IGNORECASE | re.DOTALL)
+
+    def scan(self, text):
+        details = {key: "N/A" for key in FIELDS}
+        remaining = len(self.fields)
+        for match in self.scanner.finditer(text):
+            key = self.fields[int(match.lastgroup[1:])]
+            if details[key] != "N/A":
+                continue
+            value = match.group(match.lastgroup)
+            if key in NUMERIC_FIELDS:
+                try:
+                    details[key] = float(value.replace(',', ''))
+                except ValueError:
+                    continue
+            else:
+                details[key] = value.strip()
+            remaining -= 1
+            if not remaining:
+                break
+        return details
+
+
+class TemplateSet:
+    """
+    Picks the most specific template whose markers all appear in the header.
+    Templates without markers act as the fallback.
+    """
+
+    def __init__(self, templates):
+        self.templates = sorted(templates, key=lambda t: len(t.markers), reverse=True)
+        self.markers = {m for t in self.templates for m in t.markers}
+        fallbacks = [t for t in self.templates if not t.markers]
+        if not fallbacks:
+            raise ValueError("TemplateSet needs a template without markers as the fallback")
+        self.fallback = fallbacks[0]
+
+    def select(self, text):
+        header = text[:HEADER_SIZE].lower()
+        present = {m for m in self.markers if m in header}
+        for template in self.templates:
+            if template.markers and present.issuperset(template.markers):
+                return template
+        return self.fallback
+
+    def scan(self, text):
+        """
+        Return (details, template_name) for the cleaned invoice text.
+        """
+        template = self.select(text)
+        return template.scan(text), template.name
+
+
+def load_templates(json_path):
+    with open(json_path) as f:
+        entries = json.load(f)
+    return [InvoiceTemplate(e['name'], e['patterns'], e.get('markers', ())) for e in entries]
+
+
+DEFAULT_TEMPLATES = TemplateSet([
+    InvoiceTemplate('standard', STANDARD_PATTERNS),
+    InvoiceTemplate('invoice-hash', HASH_PATTERNS, markers=('invoice #', 'invoice date')),
+])
+
+
+def build_template_set(json_path=None):
+    # The built-in layouts plus any loaded from json_path
+    if json_path is None:
+        return DEFAULT_TEMPLATES
+    return TemplateSet(DEFAULT_TEMPLATES.templates + load_templates(json_path))
+
+
+def scan_invoice(text, templates=DEFAULT_TEMPLATES):
+    return templates.scan(text)
+
+
+def process_pdf_with_templates(pdf_path, templates=DEFAULT_TEMPLATES):
+    cleaned_text = clean_extracted_text(extract_text_from_pdf(pdf_path))
+    details, template_name = templates.scan(cleaned_text)
+    details['Template'] = template_name
+    return details
@@ -0,0 +1,157 @@
+"""
+Streaming sinks for invoice results.
+
+Rows are written as they arrive instead of being collected into a list and
+written at the end, so memory stays constant regardless of batch size.
+
+- ExcelStreamWriter: openpyxl write-only workbook. Rows are spooled to a
+  temporary file by openpyxl; the .xlsx itself only exists after close(),
+  so a crash loses the whole run. Prefer CSV for large batches.
+- CsvStreamWriter: flushed to disk every `flush_every` rows, so a crash late
+  in a run keeps everything written up to the last flush.
+- ParquetStreamWriter: one row group per `flush_every` rows (needs pyarrow).
+  This bounds memory, not loss: the file is only readable once close()
+  writes the footer, so a crash loses every row.
+
+Use open_writer(path) to pick the sink from the file extension.
+"""
+
+import csv
+import os
+
+import openpyxl
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Font
+
+from main import HEADERS, NUMERIC_FIELDS
+
+FLUSH_EVERY = 500
+
+
+class ExcelStreamWriter:
+    def __init__(self, output_path, columns=HEADERS):
+        self.output_path = output_path
+        self.columns = list(columns)
+        self.rows_written = 0
+        self.wb = openpyxl.Workbook(write_only=True)
+        self.ws = self.wb.create_sheet("Invoice Details")
+
+        header_row = []
+        for header in self.columns:
+            cell = WriteOnlyCell(self.ws, value=header)
+            cell.alignment = Alignment(horizontal='center', vertical='center')
+            cell.font = Font(bold=True)
+            header_row.append(cell)
+        self.ws.append(header_row)
+
+    def write(self, details):
+        self.ws.append([details.get(key, "N/A") for key in self.columns])
+        self.rows_written += 1
+
+    def close(self):
+        self.wb.save(self.output_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class CsvStreamWriter:
+    def __init__(self, output_path, columns=HEADERS, flush_every=FLUSH_EVERY):
+        self.output_path = output_path
+        self.columns = list(columns)
+        self.flush_every = flush_every
+        self.rows_written = 0
+        self.file = open(output_path, 'w', newline='', encoding='utf-8')
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(self.columns)
+
+    def write(self, details):
+        self.writer.writerow([details.get(key, "N/A") for key in self.columns])
+        self.rows_written += 1
+        if self.rows_written % self.flush_every == 0:
+            self.flush()
+
+    def flush(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ParquetStreamWriter:
+    def __init__(self, output_path, columns=HEADERS, flush_every=FLUSH_EVERY):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Parquet output needs pyarrow: pip install pyarrow")
+
+        self.output_path = output_path
+        self.columns = list(columns)
+        self.flush_every = flush_every
+        self.rows_written = 0
+        self.buffer = []
+        self._pa = pa
+        self.schema = pa.schema([
+            (key, pa.float64() if key in NUMERIC_FIELDS else pa.string()) for key in self.columns
+        ])
+        self.writer = pq.ParquetWriter(output_path, self.schema)
+
+    def write(self, details):
+        row = {}
+        for key in self.columns:
+            value = details.get(key, "N/A")
+            if key in NUMERIC_FIELDS:
+                # "N/A" becomes a null rather than forcing the column to strings
+                row[key] = value if isinstance(value, (int, float)) else None
+            else:
+                row[key] = None if value is None else str(value)
+        self.buffer.append(row)
+        self.rows_written += 1
+        if len(self.buffer) >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        if self.buffer:
+            self.writer.write_table(self._pa.Table.from_pylist(self.buffer, schema=self.schema))
+            self.buffer = []
+
+    def close(self):
+        self.flush()
+        self.writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# Sinks that keep what was written so far if the run dies before close()
+CRASH_SAFE = ('.csv',)
+
+WRITERS = {
+    '.xlsx': ExcelStreamWriter,
+    '.csv': CsvStreamWriter,
+    '.parquet': ParquetStreamWriter,
+}
+
+
+def open_writer(output_path, columns=HEADERS, flush_every=FLUSH_EVERY):
+    extension = os.path.splitext(output_path)[1].lower()
+    if extension not in WRITERS:
+        raise ValueError(f"Unsupported output format '{extension}' (expected one of {', '.join(WRITERS)})")
+    if extension == '.xlsx':
+        return ExcelStreamWriter(output_path, columns)
+    return WRITERS[extension](output_path, columns, flush_every)
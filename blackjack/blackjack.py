@@ -1,6 +1,30 @@
 import random
+from array import array
+
+def round_outcome(player_value, dealer_value):
+    """
+    1 if the player wins, -1 if they lose, 0 for a push. A win pays the bet
+    again (even money) and a push returns it.
+    """
+    if player_value > 21:
+        return -1
+    if dealer_value > 21 or player_value > dealer_value:
+        return 1
+    if player_value < dealer_value:
+        return -1
+    return 0
+
+SUITS = ['Hearts', 'Diamonds', 'Clubs', 'Spades']
+RANKS = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'Jack', 'Queen', 'King', 'Ace']
+VALUES = {'2': 2, '3': 3, '4': 4, '5': 5, '6': 6, '7': 7, '8': 8, '9': 9, '10': 10,
+          'Jack': 10, 'Queen': 10, 'King': 10, 'Ace': 11}
+
+# Cards dealt in one round can't exceed this, so the cut card always leaves enough
+MAX_ROUND_CARDS = 24
 
 class Card:
+    __slots__ = ('suit', 'rank', 'value')
+
     def __init__(self, suit, rank, value):
         self.suit = suit
         self.rank = rank
@@ -9,37 +33,89 @@ class Card:
     def __str__(self):
         return f"{self.rank} of {self.suit}"
 
-class Deck:
-    def __init__(self):
-        suits = ['Hearts', 'Diamonds', 'Clubs', 'Spades']
-        ranks = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'Jack', 'Queen', 'King', 'Ace']
-        values = {'2': 2, '3': 3, '4': 4, '5': 5, '6': 6, '7': 7, '8': 8, '9': 9, '10': 10,
-                  'Jack': 10, 'Queen': 10, 'King': 10, 'Ace': 11}
-        self.cards = [Card(suit, rank, values[rank]) for suit in suits for rank in ranks]
+# The 52 distinct cards; shoes hold indexes into this, so dealing never allocates
+CARDS = tuple(Card(suit, rank, VALUES[rank]) for suit in SUITS for rank in RANKS)
+
+class Shoe:
+    """
+    N decks as card indexes in one preallocated array, dealt from a cursor.
+    Once the cursor passes the cut card (penetration), needs_shuffle is set
+    and the next shuffle() starts over.
+    """
+    __slots__ = ('decks', 'cards', 'cursor', 'cut', 'rng')
+
+    def __init__(self, decks=1, penetration=0.75, rng=None):
+        self.decks = decks
+        self.cards = array('b', range(len(CARDS))) * decks
+        self.cursor = 0
+        self.cut = Shoe.cut_card(len(self.cards), penetration)
+        self.rng = rng or random.Random()
+
+    @staticmethod
+    def cut_card(size, penetration):
+        cut = min(int(size * penetration), size - MAX_ROUND_CARDS)
+        if cut <= 0:
+            raise ValueError("Shoe too small for the requested penetration")
+        return cut
+
+    def values(self):
+        # Card values in shoe order (ace = 11), e.g. for the simulator
+        return array('b', (CARDS[i].value for i in self.cards))
 
     def shuffle(self):
-        random.shuffle(self.cards)
+        self.rng.shuffle(self.cards)
+        self.cursor = 0
+
+    @property
+    def needs_shuffle(self):
+        return self.cursor >= self.cut
 
     def deal_card(self):
-        return self.cards.pop()
+        if self.cursor >= len(self.cards):
+            self.shuffle()
+        card = CARDS[self.cards[self.cursor]]
+        self.cursor += 1
+        return card
+
+class Deck(Shoe):
+    """
+    A single deck, dealt all the way through before reshuffling.
+    """
+    __slots__ = ()
+
+    def __init__(self, rng=None):
+        super().__init__(decks=1, penetration=1.0, rng=rng)
+        self.cut = len(self.cards)
 
 class Hand:
+    """
+    Totals are kept up to date as cards are added: hard counts aces as 1,
+    value is the best total (one ace as 11 when that doesn't bust) and soft
+    says whether an ace is currently counted as 11.
+    """
+    __slots__ = ('cards', 'hard', 'aces', 'value', 'soft')
+
     def __init__(self):
         self.cards = []
-        self.value = 0
+        self.clear()
+
+    def clear(self):
+        # Reuse the hand (and its card list) for the next round
+        self.cards.clear()
+        self.hard = 0
         self.aces = 0
+        self.value = 0
+        self.soft = False
 
     def add_card(self, card):
         self.cards.append(card)
-        self.value += card.value
-        if card.rank == 'Ace':
+        if card.value == 11:
             self.aces += 1
-        self.adjust_for_ace()
-
-    def adjust_for_ace(self):
-        while self.value > 21 and self.aces:
-            self.value -= 10
-            self.aces -= 1
+            self.hard += 1
+        else:
+            self.hard += card.value
+        self.soft = self.aces > 0 and self.hard + 10 <= 21
+        self.value = self.hard + 10 if self.soft else self.hard
 
     def __str__(self):
         return ', '.join([str(card) for card in self.cards])
@@ -63,22 +139,37 @@ class Dealer:
     def __init__(self):
         self.hand = Hand()
 
-    def play(self, deck):
-        while self.hand.value < 17:
-            self.hand.add_card(deck.deal_card())
+    def play(self, deck, hit_soft_17=False):
+        hand = self.hand
+        while hand.value < 17 or (hit_soft_17 and hand.value == 17 and hand.soft):
+            hand.add_card(deck.deal_card())
 
 class BlackjackGame:
-    def __init__(self, player_name, balance):
-        self.deck = Deck()
+    def __init__(self, player_name, balance, decks=1, penetration=0.75, hints=True):
+        self.deck = Shoe(decks, penetration)
         self.deck.shuffle()
         self.player = Player(player_name, balance)
         self.dealer = Dealer()
         self.current_bet = 0
+        self.hints = hints
+        self.strategy = None
+
+    def hint(self):
+        # strategy imports the simulator, which imports this module
+        from simulator import Rules
+        from strategy import action_hint, solve
+        if self.strategy is None:
+            self.strategy = solve(Rules(decks=self.deck.decks)).table
+        can_double = self.player.balance >= self.current_bet
+        return action_hint(self.strategy, self.player.hand, self.dealer.hand.cards[0].value, can_double)
 
     def place_bet(self, amount):
         self.current_bet = self.player.bet(amount)
 
     def deal_initial_cards(self):
+        if self.deck.needs_shuffle:
+            print("Shuffling the shoe...")
+            self.deck.shuffle()
         for _ in range(2):
             self.player.hand.add_card(self.deck.deal_card())
             self.dealer.hand.add_card(self.deck.deal_card())
@@ -87,6 +178,8 @@ class BlackjackGame:
         while True:
             print(f"Your hand: {self.player.hand} (Value: {self.player.hand.value})")
             print(f"Dealer's visible card: {self.dealer.hand.cards[0]}")
+            if self.hints:
+                print(f"Hint: {self.hint()}")
             choice = input("Choose an action: (H)it, (S)tand, (D)ouble down: ").strip().lower()
             if choice == 'h':
                 self.player.hand.add_card(self.deck.deal_card())
@@ -115,20 +208,19 @@ class BlackjackGame:
         print(f"Dealer's hand: {self.dealer.hand} (Value: {self.dealer.hand.value})")
 
     def determine_winner(self):
-        if self.player.hand.value > 21:
-            print("You lose this round.")
-        elif self.dealer.hand.value > 21 or self.player.hand.value > self.dealer.hand.value:
+        outcome = round_outcome(self.player.hand.value, self.dealer.hand.value)
+        if outcome > 0:
             print("You win this round!")
             self.player.win_bet(self.current_bet * 2)
-        elif self.player.hand.value < self.dealer.hand.value:
+        elif outcome < 0:
             print("You lose this round.")
         else:
             print("It's a push! Your bet is returned.")
             self.player.win_bet(self.current_bet)
 
     def reset_hands(self):
-        self.player.hand = Hand()
-        self.dealer.hand = Hand()
+        self.player.hand.clear()
+        self.dealer.hand.clear()
 
     def play(self):
         print(f"Welcome to Blackjack, {self.player.name}! Your starting balance is ${self.player.balance}.")
@@ -0,0 +1,469 @@
+"""
+Headless Monte Carlo blackjack simulator.
+
+Plays many independent shoes side by side. Each shoe is a row of an int8
+array of card values (2-10, ace = 11) with its own cursor, so one "round"
+deals a hand from every shoe at once and every step of play (player
+decisions, dealer drawing, settling) is a handful of array operations over
+all the hands still in play. A shoe is reshuffled once its cursor passes
+the cut card.
+
+Player decisions come from a strategy table indexed by
+[soft, total, dealer upcard]. Hands are settled exactly as
+BlackjackGame.determine_winner does (see round_outcome): a win pays even
+money, a push returns the bet, and the dealer stands on all 17s unless the
+rules say otherwise. The default Rules reproduce the terminal game: one
+deck, no separate blackjack payout, doubling allowed at any point, no
+splits.
+
+Runs are split across worker processes (see simulate) and are
+reproducible: the same --seed and --workers give the same numbers.
+
+Usage:
+    python simulator.py --hands 10000000
+    python simulator.py --hands 10000000 --decks 6 --naturals --blackjack-pays 1.5 --hit-soft-17
+    python simulator.py --hands 1e9 --workers 8 --target-ci 0.0005 --seed 42
+"""
+
+import argparse
+import math
+import multiprocessing
+import os
+import random
+import time
+
+import numpy as np
+
+from blackjack import Dealer, Hand, Shoe, round_outcome
+
+STAND, HIT, DOUBLE, DOUBLE_OR_STAND = 0, 1, 2, 3  # DOUBLE falls back to a hit when doubling isn't allowed
+
+
+class Rules:
+    def __init__(self, decks=1, hit_soft_17=False, naturals=False, blackjack_pays=1.5,
+                 double_after_hit=True, penetration=0.75):
+        """
+        naturals: settle two-card 21s before play (dealer peeks); the player's
+            pays blackjack_pays, the dealer's beats everything but another one.
+            Off, as in the game, a natural is just a 21.
+        double_after_hit: the game lets you double at any point, not only on
+            the first two cards.
+        penetration: fraction of the shoe dealt before reshuffling (capped so a
+            round always fits).
+        """
+        self.decks = decks
+        self.hit_soft_17 = hit_soft_17
+        self.naturals = naturals
+        self.blackjack_pays = blackjack_pays
+        self.double_after_hit = double_after_hit
+        self.penetration = penetration
+
+    def __repr__(self):
+        return (f"Rules(decks={self.decks}, hit_soft_17={self.hit_soft_17}, naturals={self.naturals}, "
+                f"blackjack_pays={self.blackjack_pays}, double_after_hit={self.double_after_hit}, "
+                f"penetration={self.penetration})")
+
+
+def make_shoe(decks):
+    # Card values of an unshuffled game Shoe
+    return np.frombuffer(Shoe(decks).values(), dtype=np.int8).copy()
+
+
+def empty_strategy():
+    # [soft, total, upcard]; totals past 21 and upcards below 2 are unused
+    return np.full((2, 32, 12), STAND, dtype=np.int8)
+
+
+def dealer_strategy():
+    """
+    Mimic the dealer: hit below 17, never double.
+    """
+    table = empty_strategy()
+    table[:, :17, :] = HIT
+    return table
+
+
+def basic_strategy():
+    """
+    Textbook hit/stand/double basic strategy for a dealer standing on soft 17
+    (no splits, since the game has none).
+    """
+    table = empty_strategy()
+    up = np.arange(12)
+    between = lambda low, high: (up >= low) & (up <= high)
+
+    hard = table[0]
+    hard[:12] = HIT
+    hard[9] = np.where(between(3, 6), DOUBLE, HIT)
+    hard[10] = np.where(between(2, 9), DOUBLE, HIT)
+    hard[11] = np.where(between(2, 10), DOUBLE, HIT)
+    hard[12] = np.where(between(4, 6), STAND, HIT)
+    hard[13:17] = np.where(between(2, 6), STAND, HIT)
+
+    soft = table[1]
+    soft[:18] = HIT
+    soft[13:15] = np.where(between(5, 6), DOUBLE, HIT)
+    soft[15:17] = np.where(between(4, 6), DOUBLE, HIT)
+    soft[17] = np.where(between(3, 6), DOUBLE, HIT)
+    soft[18] = np.where(between(3, 6), DOUBLE_OR_STAND, np.where(between(2, 8), STAND, HIT))
+    return table
+
+
+STRATEGIES = {'basic': basic_strategy, 'dealer': dealer_strategy}
+
+
+def strategy_table(name, rules):
+    """
+    Table for a STRATEGIES name, or 'solved' for the solver's table for these rules.
+    """
+    if name == 'solved':
+        from strategy import solve  # strategy imports this module
+        return solve(rules).table
+    return STRATEGIES[name]()
+
+
+def add_cards(total, soft, cards):
+    """
+    Add one card to each hand. soft counts aces still valued at 11.
+    """
+    total = total + cards
+    soft = soft + (cards == 11)
+    # A card adds at most 11, so two corrections always bring a hand back under 22 if it can be
+    for _ in range(2):
+        fix = (total > 21) & (soft > 0)
+        total = total - 10 * fix
+        soft = soft - fix
+    return total, soft
+
+
+# round_outcome for every (player total, dealer total) pair, so settling is one lookup
+OUTCOMES = np.array([[round_outcome(p, d) for d in range(32)] for p in range(32)], dtype=np.int8)
+
+
+def settle(player_total, dealer_total):
+    # 1 win, 0 push, -1 loss
+    return OUTCOMES[player_total, dealer_total]
+
+
+class Simulator:
+    def __init__(self, rules=None, strategy=None, shoes=100_000, seed=None):
+        self.rules = rules or Rules()
+        self.strategy = basic_strategy() if strategy is None else strategy
+        self.rng = np.random.default_rng(seed)
+
+        base = make_shoe(self.rules.decks)
+        self.size = len(base)
+        self.cut = Shoe.cut_card(self.size, self.rules.penetration)
+        self.shoes = np.tile(base, (shoes, 1))
+        self.rng.permuted(self.shoes, axis=1, out=self.shoes)
+        self.cursor = np.zeros(shoes, dtype=np.int64)
+        self.rows = np.arange(shoes)
+
+    def _reshuffle(self):
+        rows = np.flatnonzero(self.cursor >= self.cut)
+        if len(rows):
+            self.shoes[rows] = self.rng.permuted(self.shoes[rows], axis=1)
+            self.cursor[rows] = 0
+
+    def _draw(self, rows):
+        cards = self.shoes[rows, self.cursor[rows]]
+        self.cursor[rows] += 1
+        return cards
+
+    def play_round(self):
+        """
+        Deal and settle one hand from every shoe. Returns each hand's net
+        result in units of the initial bet.
+        """
+        rules = self.rules
+        self._reshuffle()
+        n = len(self.rows)
+
+        dealt = self.shoes[self.rows[:, None], self.cursor[:, None] + np.arange(4)]
+        self.cursor += 4
+        zero = np.zeros(n, dtype=np.int16)
+        p_total, p_soft = add_cards(*add_cards(zero, zero, dealt[:, 0]), dealt[:, 2])
+        d_total, d_soft = add_cards(*add_cards(zero, zero, dealt[:, 1]), dealt[:, 3])
+        upcard = dealt[:, 1]
+
+        net = np.zeros(n)
+        bet = np.ones(n, dtype=np.int8)
+        done = np.zeros(n, dtype=bool)
+        if rules.naturals:
+            player_bj, dealer_bj = p_total == 21, d_total == 21
+            net[player_bj & ~dealer_bj] = rules.blackjack_pays
+            net[dealer_bj & ~player_bj] = -1
+            done = player_bj | dealer_bj
+
+        # Player: look up every live hand's action, then deal to those that take a card
+        active = np.flatnonzero(~done & (p_total < 21))
+        first = True
+        while len(active):
+            action = self.strategy[(p_soft[active] > 0).astype(np.intp), p_total[active], upcard[active]]
+            can_double = first or rules.double_after_hit
+            action = np.where(action == DOUBLE, DOUBLE if can_double else HIT, action)
+            action = np.where(action == DOUBLE_OR_STAND, DOUBLE if can_double else STAND, action)
+            first = False
+
+            takes = action != STAND
+            drawing = active[takes]
+            bet[active[action == DOUBLE]] = 2
+            p_total[drawing], p_soft[drawing] = add_cards(p_total[drawing], p_soft[drawing], self._draw(drawing))
+            active = drawing[(action[takes] == HIT) & (p_total[drawing] < 21)]
+
+        # Dealer draws only where the player is still standing
+        active = np.flatnonzero(~done & (p_total <= 21))
+        while len(active):
+            total, soft = d_total[active], d_soft[active]
+            hits = (total < 17) | (rules.hit_soft_17 & (total == 17) & (soft > 0))
+            active = active[hits]
+            if len(active):
+                d_total[active], d_soft[active] = add_cards(d_total[active], d_soft[active], self._draw(active))
+
+        live = ~done
+        net[live] = settle(p_total[live], d_total[live]) * bet[live]
+        return net
+
+
+class ReferenceSimulator:
+    """
+    The same rules and strategy played one hand at a time with the game's
+    Shoe, Hand and Dealer classes. Much slower; used to cross-check the
+    vectorized engine (--reference).
+    """
+
+    def __init__(self, rules=None, strategy=None, seed=None):
+        self.rules = rules or Rules()
+        self.strategy = basic_strategy() if strategy is None else strategy
+        seed = np.random.SeedSequence(seed).generate_state(1)[0]
+        self.shoe = Shoe(self.rules.decks, self.rules.penetration, random.Random(int(seed)))
+        self.shoe.shuffle()
+        self.player = Hand()
+        self.dealer = Dealer()
+
+    def play_hand(self):
+        rules, shoe, player, dealer = self.rules, self.shoe, self.player, self.dealer.hand
+        if shoe.needs_shuffle:
+            shoe.shuffle()
+        player.clear()
+        dealer.clear()
+        for _ in range(2):
+            player.add_card(shoe.deal_card())
+            dealer.add_card(shoe.deal_card())
+
+        if rules.naturals and (player.value == 21 or dealer.value == 21):
+            if player.value == dealer.value:
+                return 0.0
+            return rules.blackjack_pays if player.value == 21 else -1.0
+
+        bet, first = 1, True
+        upcard = dealer.cards[0].value
+        while player.value < 21:
+            action = self.strategy[int(player.soft), player.value, upcard]
+            can_double = first or rules.double_after_hit
+            if action == DOUBLE:
+                action = DOUBLE if can_double else HIT
+            elif action == DOUBLE_OR_STAND:
+                action = DOUBLE if can_double else STAND
+            if action == STAND:
+                break
+            player.add_card(shoe.deal_card())
+            if action == DOUBLE:
+                bet = 2
+                break
+            first = False
+
+        if player.value <= 21:
+            self.dealer.play(shoe, rules.hit_soft_17)
+        return float(round_outcome(player.value, dealer.value) * bet)
+
+    def play_round(self, hands=10_000):
+        return np.array([self.play_hand() for _ in range(hands)])
+
+
+class RunningStats:
+    """
+    Count, mean and sum of squared deviations (Welford), mergeable across
+    batches and processes without keeping per-hand results.
+    """
+
+    def __init__(self, count=0, mean=0.0, m2=0.0):
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+
+    @classmethod
+    def of(cls, values):
+        mean = float(values.mean()) if len(values) else 0.0
+        return cls(len(values), mean, float(np.square(values - mean).sum()))
+
+    def merge(self, other):
+        # Chan et al. pairwise update; merge order must be fixed for bit-identical results
+        if not other.count:
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+
+    @property
+    def variance(self):
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def ci95_half_width(self):
+        return 1.96 * math.sqrt(self.variance / self.count) if self.count else math.inf
+
+    def as_tuple(self):
+        return self.count, self.mean, self.m2
+
+
+class SimulationResult:
+    def __init__(self, stats, seconds, seed_entropy=None, workers=1):
+        self.hands = stats.count
+        self.ev = stats.mean
+        self.variance = stats.variance
+        self.stderr = math.sqrt(self.variance / self.hands)
+        self.ci95 = (self.ev - 1.96 * self.stderr, self.ev + 1.96 * self.stderr)
+        self.seconds = seconds
+        self.seed_entropy = seed_entropy
+        self.workers = workers
+
+    def __str__(self):
+        return (f"{self.hands:,} hands in {self.seconds:.1f}s ({self.hands / self.seconds:,.0f}/s, "
+                f"{self.workers} worker{'s' if self.workers != 1 else ''}, seed {self.seed_entropy})\n"
+                f"EV per hand: {self.ev * 100:+.3f}% (house edge {-self.ev * 100:.3f}%)\n"
+                f"95% CI: [{self.ci95[0] * 100:+.3f}%, {self.ci95[1] * 100:+.3f}%]\n"
+                f"variance: {self.variance:.4f}  std dev: {math.sqrt(self.variance):.4f}")
+
+
+def play_hands(simulator, hands):
+    """
+    Play exactly `hands` hands on simulator and return their RunningStats.
+    """
+    stats = RunningStats()
+    while stats.count < hands:
+        stats.merge(RunningStats.of(simulator.play_round()[:hands - stats.count]))
+    return stats
+
+
+def _worker_main(conn, rules, strategy, shoes, seed):
+    # One long-lived simulator per worker, so shoes carry over between chunks
+    simulator = Simulator(rules, strategy, shoes=shoes, seed=seed)
+    while True:
+        hands = conn.recv()
+        if hands is None:
+            break
+        conn.send(play_hands(simulator, hands).as_tuple())
+    conn.close()
+
+
+class LocalWorker:
+    def __init__(self, rules, strategy, shoes, seed):
+        self.simulator = Simulator(rules, strategy, shoes=shoes, seed=seed)
+        self.pending = 0
+
+    def start(self, hands):
+        self.pending = hands
+
+    def result(self):
+        return play_hands(self.simulator, self.pending)
+
+    def close(self):
+        pass
+
+
+class ProcessWorker:
+    def __init__(self, rules, strategy, shoes, seed):
+        self.conn, child = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(target=_worker_main, args=(child, rules, strategy, shoes, seed),
+                                               daemon=True)
+        self.process.start()
+        child.close()
+
+    def start(self, hands):
+        self.conn.send(hands)
+
+    def result(self):
+        return RunningStats(*self.conn.recv())
+
+    def close(self):
+        self.conn.send(None)
+        self.process.join()
+
+
+def simulate(hands, rules=None, strategy=None, shoes=100_000, seed=None, workers=1,
+             target_ci=None, chunk=1_000_000):
+    """
+    Play up to `hands` hands and return EV, variance and a 95% confidence
+    interval in units of the initial bet.
+
+    Work goes out in epochs of `chunk` hands per worker. Each worker has its
+    own SeedSequence stream and keeps its shoes between epochs; statistics
+    are merged in worker order after every epoch, and the run stops early
+    once the CI half-width is at most target_ci. For a given seed, worker
+    count and chunk size the result is bit-for-bit the same on every run.
+    """
+    start = time.perf_counter()
+    rules = rules or Rules()
+    strategy = basic_strategy() if strategy is None else strategy
+    seed_sequence = np.random.SeedSequence(seed)
+    worker_type = LocalWorker if workers == 1 else ProcessWorker
+    per_worker_shoes = max(1, min(shoes, chunk, -(-hands // workers)))
+    pool = [worker_type(rules, strategy, per_worker_shoes, child) for child in seed_sequence.spawn(workers)]
+
+    stats = RunningStats()
+    try:
+        while stats.count < hands:
+            remaining = hands - stats.count
+            shares = [min(chunk, remaining // workers + (i < remaining % workers)) for i in range(workers)]
+            for worker, share in zip(pool, shares):
+                worker.start(share)
+            for worker in pool:
+                stats.merge(worker.result())
+            if target_ci is not None and stats.ci95_half_width <= target_ci:
+                break
+    finally:
+        for worker in pool:
+            worker.close()
+    return SimulationResult(stats, time.perf_counter() - start, seed_sequence.entropy, workers)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Estimate blackjack EV under a rule set by simulation.")
+    parser.add_argument("--hands", type=float, default=1e7)
+    parser.add_argument("--decks", type=int, default=1)
+    parser.add_argument("--hit-soft-17", action="store_true")
+    parser.add_argument("--naturals", action="store_true", help="Settle two-card 21s before play.")
+    parser.add_argument("--blackjack-pays", type=float, default=1.5)
+    parser.add_argument("--first-two-only", action="store_true", help="Only allow doubling on the first two cards.")
+    parser.add_argument("--penetration", type=float, default=0.75)
+    parser.add_argument("--strategy", choices=sorted(STRATEGIES) + ['solved'], default="basic",
+                        help="'solved' uses strategy.py's table for these rules.")
+    parser.add_argument("--shoes", type=int, default=100_000, help="Shoes played side by side.")
+    parser.add_argument("--seed", type=int, default=None, help="Reuse to reproduce a run (printed with the result).")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes.")
+    parser.add_argument("--chunk", type=int, default=1_000_000, help="Hands per worker between merges.")
+    parser.add_argument("--target-ci", type=float, default=None,
+                        help="Stop once the 95%% CI half-width is at most this (e.g. 0.0005 for +/-0.05%%).")
+    parser.add_argument("--reference", action="store_true",
+                        help="Play hand by hand with the game's classes instead (slow; for cross-checking).")
+    args = parser.parse_args()
+
+    rules = Rules(decks=args.decks, hit_soft_17=args.hit_soft_17, naturals=args.naturals,
+                  blackjack_pays=args.blackjack_pays, double_after_hit=not args.first_two_only,
+                  penetration=args.penetration)
+    print(rules)
+    strategy = strategy_table(args.strategy, rules)
+    if args.reference:
+        start = time.perf_counter()
+        stats = play_hands(ReferenceSimulator(rules, strategy, args.seed), int(args.hands))
+        print(SimulationResult(stats, time.perf_counter() - start, args.seed))
+        return
+    print(simulate(int(args.hands), rules, strategy, args.shoes, args.seed,
+                   workers=args.workers, target_ci=args.target_ci, chunk=args.chunk))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+School cost table and name search index.
+
+The IPEDS CSV is read once into typed columns: school names plus a float32
+price matrix with one column per (living situation, residency) pair, parsed
+out of the long IPEDS headers. Names are normalized (lowercase, punctuation
+dropped, "&" -> "and") and split into tokens; a sorted array of
+(token, school id) pairs lets every query token be looked up as a prefix with
+two binary searches, and a school matches when all of its tokens do.
+"""
+
+import re
+from bisect import bisect_left
+
+import numpy as np
+import pandas as pd
+
+LIVING = {
+    'on campus': 'on-campus',
+    'off campus (not with family)': 'off-campus (not with family)',
+    'off campus (with family)': 'off-campus (with family)',
+}
+RESIDENCY = ['in-district', 'in-state', 'out-of-state']
+
+HEADER_PATTERN = re.compile(
+    r"Total price for (?P<residency>in-district|in-state|out-of-state) students living "
+    r"(?P<living>on campus|off campus \(not with family\)|off campus \(with family\))\s+(?P<year>\d{4}-\d{2})"
+)
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def normalize_name(name):
+    return " ".join(tokenize(name))
+
+
+def tokenize(name):
+    return TOKEN_PATTERN.findall(str(name).lower().replace("&", " and ").replace("'", ""))
+
+
+def parse_cost_header(header):
+    """
+    'Total price for in-state students living on campus 2022-23 (DRVIC2022)'
+    -> ('on-campus', 'in-state', '2022-23'), or None for other columns.
+    """
+    match = HEADER_PATTERN.search(header)
+    if match is None:
+        return None
+    return LIVING[match['living']], match['residency'], match['year']
+
+
+class TokenIndex:
+    """
+    Sorted (token, id) pairs over a list of names, for prefix lookups.
+    """
+
+    def __init__(self, names):
+        pairs = sorted((token, i) for i, name in enumerate(names) for token in set(tokenize(name)))
+        self.tokens = [token for token, _ in pairs]
+        self.ids = np.array([i for _, i in pairs], dtype=np.int32)
+
+    def prefix_ids(self, token):
+        # Ids of names with a token starting with `token` (may repeat)
+        start = bisect_left(self.tokens, token)
+        end = bisect_left(self.tokens, token + "\uffff", start)
+        return self.ids[start:end]
+
+
+class SchoolCosts:
+    def __init__(self, data):
+        # IPEDS exports end each line with a comma, which pandas reads as an empty column
+        data = data.loc[:, ~data.columns.str.startswith('Unnamed')]
+
+        self.cost_types = []
+        cost_columns = []
+        years = set()
+        for column in data.columns:
+            parsed = parse_cost_header(column)
+            if parsed is not None:
+                self.cost_types.append(parsed[:2])
+                cost_columns.append(column)
+                years.add(parsed[2])
+        self.year = ", ".join(sorted(years))
+
+        self.names = data['instnm'].astype(str).str.strip().to_numpy(dtype=object)
+        # Missing prices stay NaN and are sent as null
+        self.prices = data[cost_columns].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float32)
+
+        self.index = TokenIndex(self.names)
+        self.normalized = [normalize_name(name) for name in self.names]
+
+    @classmethod
+    def from_csv(cls, path):
+        return cls(pd.read_csv(path, dtype={'instnm': str}))
+
+    def __len__(self):
+        return len(self.names)
+
+    def search(self, query, limit=20):
+        """
+        School ids whose name has a token starting with each query token,
+        best first: names starting with the query, then names containing it
+        as a phrase, then shorter names.
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        # Rarest token first so the intersection shrinks quickly
+        candidates = sorted((self.index.prefix_ids(token) for token in set(tokens)), key=len)
+        ids = np.unique(candidates[0])
+        for more in candidates[1:]:
+            if not len(ids):
+                break
+            ids = np.intersect1d(ids, more, assume_unique=False)
+
+        phrase = " ".join(tokens)
+
+        def rank(school_id):
+            name = self.normalized[school_id]
+            return (not name.startswith(phrase), phrase not in name, len(name), name)
+
+        return sorted(ids.tolist(), key=rank)[:limit]
+
+    def school(self, school_id):
+        prices = {}
+        for (living, residency), price in zip(self.cost_types, self.prices[school_id].tolist()):
+            prices.setdefault(living, {})[residency] = None if price != price else price
+        return {'id': school_id, 'name': self.names[school_id], 'year': self.year, 'prices': prices}
@@ -0,0 +1,248 @@
+"""
+Multi-year college cost store.
+
+`ingest` reads every yearly IPEDS export (files named like 2022-2023.csv)
+and writes one long Parquet table with a row per school x year x cost type:
+
+    school (category), campus (int8), year (int16), cost_type (category), price (float32)
+
+The year is the academic start year from the IPEDS header ("2022-23" ->
+2022). A cost type is "<living>/<residency>", e.g. "on-campus/in-state".
+IPEDS price exports don't carry the unit id, so schools are linked across
+years by name; `campus` numbers repeated names within a year (0 for the
+first) so same-named campuses stay separate.
+
+CostStore loads that table into a dense float32 cube
+[school, year, cost type] so growth, percentile and comparison queries are
+whole-array NumPy operations.
+
+Usage:
+    python cost_store.py ingest                      # every YYYY-YYYY.csv here -> costs.parquet
+    python cost_store.py growth --cost on-campus/in-state --top 10
+    python cost_store.py percentile "Abilene Christian University" --cost on-campus/out-of-state
+    python cost_store.py compare "Bucknell University" "Lafayette College" --year 2022
+"""
+
+import argparse
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from cost_index import LIVING, RESIDENCY, parse_cost_header
+from name_matcher import NameMatcher
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STORE_FILE = os.path.join(BASE_DIR, 'costs.parquet')
+YEAR_FILE_PATTERN = re.compile(r"^\d{4}-\d{4}\.csv$")
+# Display order, as in the IPEDS export
+COST_TYPES = [f"{living}/{residency}" for living in LIVING.values() for residency in RESIDENCY]
+
+
+def read_year_csv(path):
+    """
+    One yearly export as a long DataFrame (school, campus, year, cost_type, price).
+    """
+    data = pd.read_csv(path, dtype={'instnm': str})
+    columns = {}
+    for column in data.columns:
+        parsed = parse_cost_header(column)
+        if parsed is not None:
+            living, residency, year = parsed
+            columns[column] = (f"{living}/{residency}", int(year[:4]))
+    if not columns:
+        raise ValueError(f"No IPEDS price columns found in {path}")
+
+    names = data['instnm'].astype(str).str.strip()
+    wide = data[list(columns)].apply(pd.to_numeric, errors='coerce').astype(np.float32)
+    wide.columns = [columns[column][0] for column in columns]
+    wide.insert(0, 'school', names)
+    wide.insert(1, 'campus', names.groupby(names).cumcount().astype(np.int8))
+
+    long = wide.melt(id_vars=['school', 'campus'], var_name='cost_type', value_name='price')
+    years = {cost_type: year for cost_type, year in columns.values()}
+    long.insert(2, 'year', long['cost_type'].map(years).astype(np.int16))
+    return long.dropna(subset=['price'])
+
+
+def find_year_files(directory):
+    return sorted(
+        os.path.join(directory, name) for name in os.listdir(directory) if YEAR_FILE_PATTERN.match(name)
+    )
+
+
+def ingest(paths, out_path=STORE_FILE):
+    """
+    Combine yearly CSVs into the Parquet store. Later files win if two cover the same year.
+    """
+    frames = [read_year_csv(path) for path in paths]
+    if not frames:
+        raise ValueError("No yearly CSV files to ingest")
+    combined = pd.concat(frames, ignore_index=True)
+    combined = combined.drop_duplicates(subset=['school', 'campus', 'year', 'cost_type'], keep='last')
+    combined['school'] = combined['school'].astype('category')
+    combined['cost_type'] = combined['cost_type'].astype('category')
+    combined = combined.sort_values(['school', 'campus', 'year', 'cost_type'], ignore_index=True)
+    combined.to_parquet(out_path, index=False)
+    return combined
+
+
+class CostStore:
+    def __init__(self, long):
+        keys = long['school'].astype(str) + np.where(long['campus'] > 0, ' #' + (long['campus'] + 1).astype(str), '')
+        school_codes, self.schools = pd.factorize(keys, sort=True)
+        year_codes, self.years = pd.factorize(long['year'], sort=True)
+        present = set(long['cost_type'].astype(str).unique())
+        self.cost_types = [t for t in COST_TYPES if t in present] + sorted(present - set(COST_TYPES))
+        type_codes = long['cost_type'].astype(str).map({t: i for i, t in enumerate(self.cost_types)}).to_numpy()
+        self.schools = np.asarray(self.schools, dtype=object)
+        self.years = np.asarray(self.years, dtype=np.int16)
+
+        self.cube = np.full((len(self.schools), len(self.years), len(self.cost_types)), np.nan, dtype=np.float32)
+        self.cube[school_codes, year_codes, type_codes] = long['price'].to_numpy(dtype=np.float32)
+        self.school_index = {name: i for i, name in enumerate(self.schools)}
+
+    @classmethod
+    def load(cls, path=STORE_FILE):
+        return cls(pd.read_parquet(path))
+
+    def _year(self, year):
+        if year is None:
+            return len(self.years) - 1
+        matches = np.flatnonzero(self.years == year)
+        if not len(matches):
+            raise KeyError(f"No data for {year}; have {self.years.tolist()}")
+        return int(matches[0])
+
+    def _cost_type(self, cost_type):
+        try:
+            return self.cost_types.index(cost_type)
+        except ValueError:
+            raise KeyError(f"Unknown cost type {cost_type!r}; have {self.cost_types}")
+
+    def _school(self, name):
+        try:
+            return self.school_index[name]
+        except KeyError:
+            raise KeyError(f"Unknown school {name!r}")
+
+    def unknown_schools(self, names, suggestions=3):
+        """
+        {name: [closest school names]} for each name not in the store.
+        """
+        unknown = [name for name in names if name not in self.school_index]
+        if not unknown:
+            return {}
+        matcher = NameMatcher(self.schools)
+        return {name: [match for match, _, _ in matcher.match(name, suggestions)] for name in unknown}
+
+    def series(self, cost_type):
+        """
+        Prices for one cost type as a schools x years DataFrame.
+        """
+        return pd.DataFrame(self.cube[:, :, self._cost_type(cost_type)], index=self.schools, columns=self.years)
+
+    def yoy_growth(self, cost_type):
+        """
+        Year-over-year change (fraction) for every school, schools x years[1:].
+        Years without a price on either side are NaN.
+        """
+        prices = self.cube[:, :, self._cost_type(cost_type)]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            growth = prices[:, 1:] / prices[:, :-1] - 1
+        return pd.DataFrame(growth, index=self.schools, columns=self.years[1:])
+
+    def growth(self, cost_type, start_year=None, end_year=None):
+        """
+        Total and annualized growth between two years (default first to last).
+        """
+        c = self._cost_type(cost_type)
+        y0 = 0 if start_year is None else self._year(start_year)
+        y1 = self._year(end_year)
+        start, end = self.cube[:, y0, c], self.cube[:, y1, c]
+        span = int(self.years[y1]) - int(self.years[y0])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            total = end / start - 1
+            annual = (end / start) ** (1 / span) - 1 if span else np.full_like(total, np.nan)
+        return pd.DataFrame(
+            {'start': start, 'end': end, 'growth': total, 'annual_growth': annual}, index=self.schools
+        ).dropna(subset=['growth'])
+
+    def percentile_ranks(self, cost_type, year=None):
+        """
+        For every school, the percent of schools (with a price that year)
+        whose price is at or below its own. NaN where the school has no price.
+        """
+        prices = self.cube[:, self._year(year), self._cost_type(cost_type)]
+        valid = ~np.isnan(prices)
+        ordered = np.sort(prices[valid])
+        ranks = np.full(len(prices), np.nan)
+        ranks[valid] = np.searchsorted(ordered, prices[valid], side='right') / len(ordered) * 100
+        return pd.Series(ranks, index=self.schools, name='percentile')
+
+    def compare(self, schools, year=None, cost_types=None):
+        """
+        Side-by-side prices for many schools: one row per school, one column per cost type.
+        """
+        rows = np.array([self._school(name) for name in schools], dtype=np.intp)
+        types = self.cost_types if cost_types is None else list(cost_types)
+        columns = np.array([self._cost_type(t) for t in types], dtype=np.intp)
+        prices = self.cube[rows, self._year(year)][:, columns]
+        return pd.DataFrame(prices, index=self.schools[rows], columns=types)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-year college cost store.")
+    parser.add_argument('--store', default=STORE_FILE, help="Parquet store path.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    ingest_parser = commands.add_parser('ingest', help="Load yearly CSVs into the store.")
+    ingest_parser.add_argument('files', nargs='*', help="CSV files (default: every YYYY-YYYY.csv in --dir).")
+    ingest_parser.add_argument('--dir', default=BASE_DIR)
+
+    growth_parser = commands.add_parser('growth', help="Schools ranked by price growth.")
+    growth_parser.add_argument('--cost', default='on-campus/in-state')
+    growth_parser.add_argument('--start', type=int, default=None)
+    growth_parser.add_argument('--end', type=int, default=None)
+    growth_parser.add_argument('--top', type=int, default=10)
+
+    percentile_parser = commands.add_parser('percentile', help="Where schools' prices rank among all schools.")
+    percentile_parser.add_argument('schools', nargs='+')
+    percentile_parser.add_argument('--cost', default='on-campus/in-state')
+    percentile_parser.add_argument('--year', type=int, default=None)
+
+    compare_parser = commands.add_parser('compare', help="Side-by-side prices for several schools.")
+    compare_parser.add_argument('schools', nargs='+')
+    compare_parser.add_argument('--year', type=int, default=None)
+
+    args = parser.parse_args()
+
+    if args.command == 'ingest':
+        files = args.files or find_year_files(args.dir)
+        combined = ingest(files, args.store)
+        print(f"Wrote {len(combined)} prices for {combined['school'].nunique()} schools, "
+              f"years {sorted(combined['year'].unique().tolist())}, to {args.store}")
+        return
+
+    store = CostStore.load(args.store)
+    unknown = store.unknown_schools(getattr(args, 'schools', []))
+    if unknown:
+        for name, suggestions in unknown.items():
+            hint = f" Did you mean: {'; '.join(suggestions)}?" if suggestions else ""
+            print(f"School not found: {name!r}.{hint}")
+        parser.exit(1)
+    with pd.option_context('display.width', 200, 'display.max_columns', 20):
+        if args.command == 'growth':
+            growth = store.growth(args.cost, args.start, args.end)
+            print(growth.sort_values('growth', ascending=False).head(args.top))
+        elif args.command == 'percentile':
+            ranks = store.percentile_ranks(args.cost, args.year)
+            prices = store.series(args.cost)[store.years[store._year(args.year)]]
+            print(pd.DataFrame({'price': prices[args.schools], 'percentile': ranks[args.schools].round(1)}))
+        else:
+            print(store.compare(args.schools, args.year))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+"""
+Fuzzy school-name matching.
+
+Built once over the institution list, three indexes answer each query:
+
+- tokens: every query word is a prefix of some word in the name, with
+  common abbreviations expanded ("univ", "st", "mt", ...), so
+  "penn st univ" finds "Pennsylvania State University-...".
+- acronyms: initials of the significant words, of the whole name and of the
+  part before a campus dash, so "UCLA" finds
+  "University of California-Los Angeles".
+- trigrams: an inverted index of character trigrams scored by Jaccard
+  similarity, which catches typos ("Bucknel Univeristy").
+
+Scores: exact name 3, acronym 2 (prefix of an acronym 1.5), all words
+matched 1 + trigram similarity, otherwise the trigram similarity alone.
+"""
+
+from bisect import bisect_left
+from collections import defaultdict
+
+import numpy as np
+
+from cost_index import TokenIndex, normalize_name, tokenize
+
+ABBREVIATIONS = {
+    'u': ['university'],
+    'univ': ['university'],
+    'coll': ['college'],
+    'inst': ['institute'],
+    'st': ['saint', 'state'],
+    'ste': ['sainte'],
+    'mt': ['mount'],
+    'ft': ['fort'],
+    'cc': ['community'],
+    'comm': ['community'],
+    'tech': ['technology', 'technical'],
+}
+
+# Left out of acronyms: "University of California at Los Angeles" -> "ucla"
+ACRONYM_SKIP = {'of', 'the', 'and', 'at', 'in', 'for', 'a'}
+
+MIN_SCORE = 0.3
+
+
+def trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def acronyms(name):
+    forms = set()
+    for part in {name, str(name).split('-')[0]}:
+        initials = "".join(token[0] for token in tokenize(part) if token not in ACRONYM_SKIP)
+        if len(initials) >= 2:
+            forms.add(initials)
+    return forms
+
+
+class NameMatcher:
+    def __init__(self, names):
+        self.names = [str(name).strip() for name in names]
+        self.normalized = [normalize_name(name) for name in self.names]
+        self.tokens = TokenIndex(self.names)
+
+        self.exact = defaultdict(list)
+        for i, name in enumerate(self.normalized):
+            self.exact[name].append(i)
+
+        self.acronyms = sorted((form, i) for i, name in enumerate(self.names) for form in acronyms(name))
+        self.acronym_keys = [form for form, _ in self.acronyms]
+        self.acronym_ids = np.array([i for _, i in self.acronyms], dtype=np.int32)
+
+        postings = defaultdict(list)
+        self.trigram_counts = np.zeros(len(self.names), dtype=np.int32)
+        for i, name in enumerate(self.normalized):
+            grams = trigrams(name)
+            self.trigram_counts[i] = len(grams)
+            for gram in grams:
+                postings[gram].append(i)
+        self.postings = {gram: np.array(ids, dtype=np.int32) for gram, ids in postings.items()}
+
+    def _token_matches(self, tokens):
+        ids = None
+        for token in set(tokens):
+            found = [self.tokens.prefix_ids(token)]
+            found += [self.tokens.prefix_ids(expanded) for expanded in ABBREVIATIONS.get(token, [])]
+            found = np.unique(np.concatenate(found))
+            ids = found if ids is None else np.intersect1d(ids, found, assume_unique=True)
+            if not len(ids):
+                break
+        return ids
+
+    def _acronym_matches(self, token):
+        # (exact matches, longer acronyms starting with token)
+        start = bisect_left(self.acronym_keys, token)
+        end = bisect_left(self.acronym_keys, token + "\uffff", start)
+        exact_end = bisect_left(self.acronym_keys, token + "\x00", start)
+        return self.acronym_ids[start:exact_end], self.acronym_ids[exact_end:end]
+
+    def _trigram_scores(self, text):
+        grams = trigrams(text)
+        lists = [self.postings[gram] for gram in grams if gram in self.postings]
+        if not lists:
+            return np.zeros(len(self.names))
+        shared = np.bincount(np.concatenate(lists), minlength=len(self.names))
+        return shared / (len(grams) + self.trigram_counts - shared)
+
+    def match(self, query, limit=5):
+        """
+        Ranked [(name, row index, score)] for query, best first.
+        """
+        normalized = normalize_name(query)
+        if not normalized:
+            return []
+        tokens = normalized.split()
+
+        scores = self._trigram_scores(normalized)
+        token_ids = self._token_matches(tokens)
+        if len(token_ids):
+            scores[token_ids] += 1.0
+        if len(tokens) == 1 and len(tokens[0]) >= 2:
+            exact_acronym, prefix_acronym = self._acronym_matches(tokens[0])
+            if len(tokens[0]) >= 3:
+                scores[prefix_acronym] = np.maximum(scores[prefix_acronym], 1.5)
+            scores[exact_acronym] = np.maximum(scores[exact_acronym], 2.0)
+        scores[self.exact.get(normalized, [])] = 3.0
+
+        candidates = np.flatnonzero(scores >= MIN_SCORE)
+        if len(candidates) > limit:
+            candidates = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+        ranked = sorted(candidates.tolist(), key=lambda i: (-scores[i], len(self.names[i]), self.names[i]))
+        return [(self.names[i], i, float(scores[i])) for i in ranked]
@@ -1,14 +1,40 @@
 import pandas as pd
 
+from name_matcher import NameMatcher
+
 # Load the dataset
 file_path = '2022-2023.csv'  # Ensure this CSV file is in the same directory as this script
 data = pd.read_csv(file_path)
+# Built once; matches typos, abbreviations ("univ", "st") and acronyms ("UCLA")
+matcher = NameMatcher(data['instnm'])
 
 def display_headers():
     print("Available headers:")
     for idx, col in enumerate(data.columns[1:], start=1):
         print(f"{idx}: {col}")
 
+def resolve_school(name):
+    """
+    Row indexes for a typed school name: exact matches directly (several
+    campuses can share a name), otherwise the user picks from the closest
+    candidates. Empty if skipped.
+    """
+    candidates = matcher.match(name, limit=5)
+    if not candidates:
+        print(f"No schools look like '{name}'.")
+        return []
+    exact = [row for _, row, score in candidates if score >= 3.0]
+    if exact:
+        return exact
+
+    print(f"\n'{name}' is not an exact match. Did you mean:")
+    for idx, (candidate, _, _) in enumerate(candidates, start=1):
+        print(f"{idx}: {candidate}")
+    choice = input("Enter a number (or press Enter to skip): ").strip()
+    if choice.isdigit() and 1 <= int(choice) <= len(candidates):
+        return [candidates[int(choice) - 1][1]]
+    return []
+
 def filter_data():
     while True:
         print("\nEnter the school name(s) (comma-separated) you want to search for, or 'exit' to quit:")
@@ -16,8 +42,9 @@ def filter_data():
         if user_input.lower() == 'exit':
             break
         
-        school_names = [name.strip() for name in user_input.split(',')]
-        filtered_data = data[data['instnm'].isin(school_names)]
+        school_names = [name.strip() for name in user_input.split(',') if name.strip()]
+        rows = [row for name in school_names for row in resolve_school(name)]
+        filtered_data = data.iloc[sorted(set(rows))]
         
         if filtered_data.empty:
             print("No matching schools found.")
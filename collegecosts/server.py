@@ -0,0 +1,48 @@
+"""
+Small API for the college cost page.
+
+Loads the cost CSV and builds the name index once at startup, then serves:
+    /                      the lookup page (index.html)
+    /api/schools?q=&limit= matching schools as [{id, name}], best first
+    /api/schools/<id>      one school's prices by living situation and residency
+
+Usage:
+    python server.py                # http://127.0.0.1:5000
+    COSTS_FILE=2023-2024.csv python server.py
+"""
+
+import os
+
+from flask import Flask, abort, jsonify, request, send_from_directory
+
+from cost_index import SchoolCosts
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+COSTS_FILE = os.environ.get('COSTS_FILE', os.path.join(BASE_DIR, '2022-2023.csv'))
+MAX_RESULTS = 50
+
+app = Flask(__name__)
+costs = SchoolCosts.from_csv(COSTS_FILE)
+
+
+@app.route('/')
+def index():
+    return send_from_directory(BASE_DIR, 'index.html')
+
+
+@app.route('/api/schools')
+def search_schools():
+    query = request.args.get('q', '')
+    limit = max(1, min(request.args.get('limit', 20, type=int), MAX_RESULTS))
+    return jsonify([{'id': school_id, 'name': costs.names[school_id]} for school_id in costs.search(query, limit)])
+
+
+@app.route('/api/schools/<int:school_id>')
+def school_costs(school_id):
+    if not 0 <= school_id < len(costs):
+        abort(404)
+    return jsonify(costs.school(school_id))
+
+
+if __name__ == '__main__':
+    app.run(debug=True)
@@ -0,0 +1,299 @@
+"""
+Live scoreboard poller.
+
+Polls the data.nba.net scoreboard on an adaptive interval (fast while games are
+live, slow otherwise), diffs each response against the previous snapshot and
+emits only the games that changed, either as JSON lines on stdout or as
+Server-Sent Events on a small local HTTP endpoint.
+
+Usage:
+    python scoreboard_poller.py                 # JSON lines on stdout
+    python scoreboard_poller.py --sse-port 8765 # SSE on http://localhost:8765/events
+"""
+
+import argparse
+import calendar
+import json
+import queue
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+BASE_URL = "https://data.nba.net"
+ALL_JSON = "/prod/v1/today.json"
+
+LIVE_INTERVAL = 10       # seconds between polls while any game is in progress
+PREGAME_INTERVAL = 60    # seconds between polls when a game starts within the hour
+IDLE_INTERVAL = 600      # seconds between polls when nothing is happening
+MAX_BACKOFF = 900        # cap for the error backoff
+LINKS_TTL = 3600         # re-resolve today.json links (the scoreboard URL changes daily)
+CLIENT_QUEUE_SIZE = 256  # events buffered per SSE client before the oldest are dropped
+
+STATUS_SCHEDULED = 1
+STATUS_LIVE = 2
+STATUS_FINAL = 3
+
+
+def summarize_game(game):
+    """
+    Reduce a raw scoreboard game to the fields we report on.
+    Uses the same fields as get_scoreboard() plus the id and status.
+    """
+    home_team = game['hTeam']
+    away_team = game['vTeam']
+    return {
+        "game_id": game.get('gameId'),
+        "status": game.get('statusNum'),
+        "start_time": game.get('startTimeUTC'),
+        "home_team": home_team['triCode'],
+        "away_team": away_team['triCode'],
+        "home_score": home_team['score'],
+        "away_score": away_team['score'],
+        "clock": game['clock'],
+        "period": game['period']['current'],
+    }
+
+
+def diff_snapshots(previous, current):
+    """
+    Compare two {game_id: summary} snapshots.
+    Returns a list of events for games that were added, changed or removed.
+    """
+    events = []
+    for game_id, summary in current.items():
+        old = previous.get(game_id)
+        if old is None:
+            events.append({"event": "added", **summary})
+        elif old != summary:
+            changed = sorted(k for k in summary if summary[k] != old.get(k))
+            events.append({"event": "changed", "changed": changed, **summary})
+    for game_id in previous.keys() - current.keys():
+        events.append({"event": "removed", "game_id": game_id})
+    return events
+
+
+def next_interval(snapshot, now=None):
+    """
+    Pick the next poll delay from the state of the games in the snapshot.
+    """
+    if any(g["status"] == STATUS_LIVE for g in snapshot.values()):
+        return LIVE_INTERVAL
+
+    now = time.time() if now is None else now
+    for g in snapshot.values():
+        if g["status"] != STATUS_SCHEDULED or not g["start_time"]:
+            continue
+        try:
+            start = calendar.timegm(time.strptime(g["start_time"][:19], "%Y-%m-%dT%H:%M:%S"))
+        except ValueError:
+            continue
+        # Start times are approximate; a game that "should" have started is still treated as pregame
+        if start - now <= 3600:
+            return PREGAME_INTERVAL
+    return IDLE_INTERVAL
+
+
+class ScoreboardPoller:
+    """
+    Fetches the scoreboard with conditional requests and keeps only the latest
+    snapshot, so memory does not grow over a night of polling.
+    """
+
+    def __init__(self, session=None, timeout=10):
+        self.session = session or requests.Session()
+        self.timeout = timeout
+        self.snapshot = {}
+        self._scoreboard_url = None
+        self._links_fetched_at = 0.0
+        self._etag = None
+        self._last_modified = None
+
+    def _scoreboard(self):
+        if self._scoreboard_url is None or time.time() - self._links_fetched_at > LINKS_TTL:
+            response = self.session.get(BASE_URL + ALL_JSON, timeout=self.timeout)
+            response.raise_for_status()
+            url = BASE_URL + response.json()['links']['currentScoreboard']
+            if url != self._scoreboard_url:
+                self._etag = self._last_modified = None
+            self._scoreboard_url = url
+            self._links_fetched_at = time.time()
+        return self._scoreboard_url
+
+    def fetch(self):
+        """
+        Return the list of raw games, or None if the scoreboard is unchanged (HTTP 304).
+        """
+        # Resolve the URL first: a new day's scoreboard clears the old validators
+        url = self._scoreboard()
+        headers = {}
+        if self._etag:
+            headers["If-None-Match"] = self._etag
+        if self._last_modified:
+            headers["If-Modified-Since"] = self._last_modified
+
+        response = self.session.get(url, headers=headers, timeout=self.timeout)
+        if response.status_code == 304:
+            return None
+        response.raise_for_status()
+
+        self._etag = response.headers.get("ETag")
+        self._last_modified = response.headers.get("Last-Modified")
+        return response.json().get('games', [])
+
+    def poll(self):
+        """
+        Fetch once and return the events for games that changed since the last poll.
+        """
+        games = self.fetch()
+        if games is None:
+            return []
+        current = {}
+        for game in games:
+            summary = summarize_game(game)
+            current[summary["game_id"]] = summary
+        events = diff_snapshots(self.snapshot, current)
+        self.snapshot = current
+        return events
+
+    def run(self, emit, stop_event=None):
+        """
+        Poll until stop_event is set, passing each event to emit().
+        """
+        stop_event = stop_event or threading.Event()
+        backoff = LIVE_INTERVAL
+        while not stop_event.is_set():
+            try:
+                for event in self.poll():
+                    emit(event)
+                delay = next_interval(self.snapshot)
+                backoff = LIVE_INTERVAL
+            except (requests.RequestException, ValueError, KeyError) as e:
+                print(f"Error polling scoreboard: {e}", file=sys.stderr)
+                # Links may have rolled over to a new day; resolve them again on the next try
+                self._scoreboard_url = None
+                delay = backoff
+                backoff = min(backoff * 2, MAX_BACKOFF)
+            stop_event.wait(delay)
+
+
+def print_event(event):
+    print(json.dumps(event), flush=True)
+
+
+class EventBroadcaster:
+    """
+    Fans events out to connected SSE clients through bounded queues.
+    A slow client loses its oldest events instead of growing memory.
+    """
+
+    def __init__(self):
+        self._clients = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self):
+        q = queue.Queue(maxsize=CLIENT_QUEUE_SIZE)
+        with self._lock:
+            self._clients.add(q)
+        return q
+
+    def unsubscribe(self, q):
+        with self._lock:
+            self._clients.discard(q)
+
+    def publish(self, event):
+        with self._lock:
+            clients = list(self._clients)
+        for q in clients:
+            while True:
+                try:
+                    q.put_nowait(event)
+                    break
+                except queue.Full:
+                    try:
+                        q.get_nowait()
+                    except queue.Empty:
+                        pass
+
+
+def make_sse_handler(broadcaster, poller):
+    class SSEHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == "/snapshot":
+                body = json.dumps(list(poller.snapshot.values())).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                return
+            if self.path != "/events":
+                self.send_error(404)
+                return
+
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+
+            q = broadcaster.subscribe()
+            try:
+                while True:
+                    try:
+                        event = q.get(timeout=15)
+                        self.wfile.write(f"event: {event['event']}\ndata: {json.dumps(event)}\n\n".encode())
+                    except queue.Empty:
+                        # Comment line keeps proxies from closing an idle stream
+                        self.wfile.write(b": keepalive\n\n")
+                    self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+            finally:
+                broadcaster.unsubscribe(q)
+
+        def log_message(self, format, *args):
+            pass
+
+    return SSEHandler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Poll the NBA scoreboard and emit changed games.")
+    parser.add_argument("--sse-port", type=int, default=None,
+                        help="Serve events as SSE on this port instead of printing JSON lines.")
+    parser.add_argument("--once", action="store_true", help="Poll a single time and exit.")
+    args = parser.parse_args()
+
+    poller = ScoreboardPoller()
+    if args.once:
+        for event in poller.poll():
+            print_event(event)
+        return
+
+    if args.sse_port is None:
+        try:
+            poller.run(print_event)
+        except KeyboardInterrupt:
+            pass
+        return
+
+    broadcaster = EventBroadcaster()
+    server = ThreadingHTTPServer(("127.0.0.1", args.sse_port), make_sse_handler(broadcaster, poller))
+    server.daemon_threads = True
+    stop_event = threading.Event()
+    thread = threading.Thread(target=poller.run, args=(broadcaster.publish, stop_event), daemon=True)
+    thread.start()
+    print(f"Serving scoreboard events on http://127.0.0.1:{args.sse_port}/events")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop_event.set()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
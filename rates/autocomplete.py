@@ -0,0 +1,135 @@
+"""
+Prefix autocomplete for the rate search fields.
+
+A trie is built per field when the rate sheet loads. Values are inserted in
+descending order of how many lanes use them, so each node simply keeps the
+first TOP_K values that pass through it. A prefix lookup is then a walk of
+len(prefix) nodes with the ranked suggestions already waiting there.
+
+When nothing starts with the exact prefix, a bounded edit-distance walk of
+the same trie (one typo for short queries, two for longer ones) finds the
+closest values instead. The first letter is assumed to be right, which
+keeps the walk to a single subtree.
+"""
+
+from rate_table import normalize
+
+# Autocomplete parameter -> rate sheet column
+AUTOCOMPLETE_FIELDS = {
+    'origin_city': 'Origin City',
+    'destination_city': 'Destination City',
+    'carrier': 'Carrier',
+    'mode': 'Mode',
+}
+
+TOP_K = 10
+MIN_FUZZY_LENGTH = 3
+
+
+class TrieNode:
+    __slots__ = ('children', 'top')
+
+    def __init__(self):
+        self.children = {}
+        self.top = []  # [(display value, lane count)], best first
+
+
+class PrefixIndex:
+    def __init__(self, values):
+        """
+        values: iterable of raw cell values; missing and blank cells are skipped.
+        """
+        counts = {}
+        displays = {}
+        for value in values:
+            if value is None or value != value:  # None or NaN
+                continue
+            display = str(value).strip()
+            key = display.lower()
+            if not key:
+                continue
+            counts[key] = counts.get(key, 0) + 1
+            per_key = displays.setdefault(key, {})
+            per_key[display] = per_key.get(display, 0) + 1
+
+        self.root = TrieNode()
+        for key in sorted(counts, key=lambda k: (-counts[k], k)):
+            # Show the most common spelling of each value
+            entry = (max(displays[key], key=displays[key].get), counts[key])
+            node = self.root
+            if len(node.top) < TOP_K:
+                node.top.append(entry)
+            for ch in key:
+                node = node.children.setdefault(ch, TrieNode())
+                if len(node.top) < TOP_K:
+                    node.top.append(entry)
+
+    def prefix(self, query):
+        node = self.root
+        for ch in query:
+            node = node.children.get(ch)
+            if node is None:
+                return []
+        return node.top
+
+    def fuzzy(self, query, max_distance):
+        """
+        Suggestions whose prefix is within max_distance edits of query,
+        as {display: (distance, count)}.
+        """
+        found = {}
+        first = self.root.children.get(query[0]) if query else None
+        if first is None:
+            return found
+
+        # Levenshtein rows over the trie, only computing the band of cells
+        # within max_distance of the diagonal; anything outside is capped.
+        n = len(query)
+        cap = max_distance + 1
+        first_row = [min(j, cap) for j in range(n + 1)]
+        stack = [(first, query[0], 1, first_row)]
+        while stack:
+            node, ch, depth, previous = stack.pop()
+            row = [cap] * (n + 1)
+            row[0] = min(depth, cap)
+            for j in range(max(1, depth - max_distance), min(n, depth + max_distance) + 1):
+                cost = 0 if query[j - 1] == ch else 1
+                row[j] = min(row[j - 1] + 1, previous[j] + 1, previous[j - 1] + cost, cap)
+            if row[-1] <= max_distance:
+                for display, count in node.top:
+                    best = found.get(display)
+                    if best is None or row[-1] < best[0]:
+                        found[display] = (row[-1], count)
+            if min(row) <= max_distance:
+                stack.extend((child, next_ch, depth + 1, row) for next_ch, child in node.children.items())
+        return found
+
+    def suggest(self, query, limit=TOP_K):
+        """
+        Return ([(display, count), ...], used_fuzzy).
+        """
+        query = normalize(query)
+        limit = min(limit, TOP_K)
+        results = self.prefix(query)[:limit]
+        if results or len(query) < MIN_FUZZY_LENGTH:
+            return results, False
+
+        max_distance = 1 if len(query) < 8 else 2
+        ranked = sorted(self.fuzzy(query, max_distance).items(),
+                        key=lambda item: (item[1][0], -item[1][1], item[0]))
+        return [(display, count) for display, (_, count) in ranked[:limit]], True
+
+
+class Autocompleter:
+    """
+    One PrefixIndex per autocomplete field, built from a RateTable.
+    """
+
+    def __init__(self, table):
+        self.indexes = {
+            field: PrefixIndex(table.data[column].tolist())
+            for field, column in AUTOCOMPLETE_FIELDS.items()
+        }
+
+    def suggest(self, field, query, limit=TOP_K):
+        return self.indexes[field].suggest(query, limit)
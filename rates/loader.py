@@ -0,0 +1,172 @@
+"""
+Rate sheet loading with a binary cache and hot reload.
+
+Parsing rates.xlsx takes seconds, so the first load converts it to a Parquet
+file in a cache directory. The cache is keyed by the workbook's SHA-256
+(older versions' files are deleted when a new one is written), and a small
+sidecar remembers the (mtime, size) it was built from so unchanged
+workbooks are not even hashed on later starts.
+
+RatesStore watches the workbook in a background thread. When it changes, a
+new RateTable is built off to the side and swapped in with a single
+assignment; requests already running keep the table they started with.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+import pandas as pd
+
+from rate_table import RateTable
+
+
+def file_sha256(path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _atomic_write(write, path):
+    # Write to a temp file and rename, so readers never see a partial cache
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _prune_cache(base, keep):
+    # Remove cache files for older versions of the same workbook (other hashes)
+    cache_dir, name = os.path.split(base)
+    pattern = re.compile(re.escape(name) + r"\.[0-9a-f]{16}\.(parquet|pkl)$")
+    for entry in os.listdir(cache_dir):
+        path = os.path.join(cache_dir, entry)
+        if pattern.match(entry) and path != keep:
+            try:
+                os.remove(path)
+            except OSError:
+                # Still open elsewhere (e.g. on Windows); the next write retries
+                pass
+
+
+def load_rates(rates_file, cache_dir=None):
+    """
+    Return the rate sheet as a DataFrame, using (and refreshing) the binary cache.
+    Parquet and CSV sheets are also accepted; Parquet is read directly.
+    """
+    if not os.path.exists(rates_file):
+        raise FileNotFoundError(f"Rates file not found: {rates_file}")
+    if rates_file.lower().endswith('.parquet'):
+        return pd.read_parquet(rates_file)
+    read_source = pd.read_csv if rates_file.lower().endswith('.csv') else pd.read_excel
+
+    cache_dir = cache_dir or os.path.join(os.path.dirname(os.path.abspath(rates_file)), '.rates_cache')
+    os.makedirs(cache_dir, exist_ok=True)
+    base = os.path.join(cache_dir, os.path.basename(rates_file))
+    sidecar = base + '.json'
+
+    st = os.stat(rates_file)
+    meta = {}
+    if os.path.exists(sidecar):
+        with open(sidecar) as f:
+            meta = json.load(f)
+
+    if meta.get('mtime_ns') == st.st_mtime_ns and meta.get('size') == st.st_size:
+        sha256 = meta['sha256']
+    else:
+        sha256 = file_sha256(rates_file)
+
+    for extension, reader in (('.parquet', pd.read_parquet), ('.pkl', pd.read_pickle)):
+        cache_file = f"{base}.{sha256[:16]}{extension}"
+        if os.path.exists(cache_file):
+            data = reader(cache_file)
+            break
+    else:
+        data = read_source(rates_file)
+        try:
+            cache_file = f"{base}.{sha256[:16]}.parquet"
+            _atomic_write(lambda p: data.to_parquet(p, index=False), cache_file)
+        except (ImportError, ValueError, TypeError) as e:
+            # No pyarrow, or a column Parquet cannot type (e.g. mixed dates and text)
+            print(f"Parquet cache unavailable ({e}); using a pickle cache instead.")
+            cache_file = f"{base}.{sha256[:16]}.pkl"
+            _atomic_write(data.to_pickle, cache_file)
+        _prune_cache(base, cache_file)
+
+    if meta.get('sha256') != sha256 or meta.get('mtime_ns') != st.st_mtime_ns:
+        new_meta = {'mtime_ns': st.st_mtime_ns, 'size': st.st_size, 'sha256': sha256}
+
+        def write_meta(path):
+            with open(path, 'w') as f:
+                json.dump(new_meta, f)
+
+        _atomic_write(write_meta, sidecar)
+
+    return data
+
+
+class RatesStore:
+    """
+    Holds the current RateTable and swaps in a new one when the workbook changes.
+    """
+
+    def __init__(self, rates_file, cache_dir=None):
+        self.rates_file = rates_file
+        self.cache_dir = cache_dir
+        self.version = 0
+        self.on_reload = []
+        self._stat = None
+        self._lock = threading.Lock()
+        self.table = None
+        self.current = (0, None)
+        self.reload()
+
+    def _current_stat(self):
+        st = os.stat(self.rates_file)
+        return st.st_mtime_ns, st.st_size
+
+    def reload(self):
+        with self._lock:
+            stat = self._current_stat()
+            table = RateTable(load_rates(self.rates_file, self.cache_dir))
+            # Single reference assignment: in-flight requests keep the old table.
+            # `current` pairs the table with its version for cache keys.
+            self.version += 1
+            self.current = (self.version, table)
+            self.table = table
+            self._stat = stat
+        for callback in self.on_reload:
+            callback(self)
+
+    def reload_if_changed(self):
+        try:
+            changed = self._current_stat() != self._stat
+        except FileNotFoundError:
+            # Mid-replace by an editor or copy; try again next time
+            return False
+        if changed:
+            self.reload()
+        return changed
+
+    def start_watching(self, interval=5.0):
+        def watch():
+            while True:
+                time.sleep(interval)
+                try:
+                    if self.reload_if_changed():
+                        print(f"Reloaded {self.rates_file} ({len(self.table)} rates)")
+                except Exception as e:
+                    # Keep serving the previous table if the new sheet is unreadable
+                    print(f"Failed to reload {self.rates_file}: {e}")
+
+        thread = threading.Thread(target=watch, daemon=True)
+        thread.start()
+        return thread
@@ -0,0 +1,192 @@
+"""
+Load test for the rates app.
+
+Generates a synthetic rate sheet of the requested size (lanes drawn with a
+skewed popularity, like a real sheet where a few lanes dominate), then
+drives /search with a mix of queries and reports req/s and p50/p95/p99
+latency, followed by the server-side split from /metrics.
+
+By default requests go through Flask's test client in this process. Pass
+--url to drive a server that is already running (start it with
+RATES_FILE pointing at the generated sheet, see --sheet).
+
+Usage:
+    python loadtest.py --rows 200000 --requests 5000
+    python loadtest.py --rows 200000 --sheet /tmp/rates.parquet --generate-only
+    RATES_FILE=/tmp/rates.parquet python rates.py &
+    python loadtest.py --sheet /tmp/rates.parquet --url http://127.0.0.1:5000 --concurrency 16
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+STATES = ['PA', 'OH', 'NY', 'NJ', 'TX', 'CA', 'IL', 'GA', 'FL', 'WA', 'CO', 'MI']
+MODES = ['Truck', 'Rail', 'LTL', 'Intermodal']
+
+# Share of each query shape in the mix
+QUERY_MIX = {
+    'lane': 0.55,            # origin + destination city/state
+    'origin_carrier': 0.15,  # origin city/state + carrier
+    'destination': 0.10,     # destination city/state only
+    'carrier_mode': 0.10,    # carrier + mode
+    'miss': 0.10,            # a city that is not in the sheet
+}
+
+
+def _zipf_choice(rng, n, size, a=1.2):
+    # Rank-based skew: item i is picked with weight 1 / (i + 1) ** a
+    weights = 1.0 / np.arange(1, n + 1) ** a
+    return rng.choice(n, size=size, p=weights / weights.sum())
+
+
+def generate_sheet(rows, seed=0, n_cities=400, n_carriers=25):
+    rng = np.random.default_rng(seed)
+    cities = np.array([f"City {i}" for i in range(n_cities)])
+    city_states = np.array([STATES[i % len(STATES)] for i in range(n_cities)])
+    carriers = np.array([f"Carrier {chr(65 + i % 26)}{i // 26 or ''}" for i in range(n_carriers)])
+
+    origin = _zipf_choice(rng, n_cities, rows)
+    destination = _zipf_choice(rng, n_cities, rows)
+    rate_1 = rng.integers(300, 5000, rows)
+    fsc_1 = (rate_1 * rng.uniform(0.03, 0.12, rows)).round()
+    return pd.DataFrame({
+        'Carrier': carriers[_zipf_choice(rng, n_carriers, rows, a=0.8)],
+        'Mode': rng.choice(MODES, rows, p=[0.5, 0.2, 0.2, 0.1]),
+        'Origin City': cities[origin],
+        'Origin State': city_states[origin],
+        'Origin Zip Code': rng.integers(10000, 99999, rows),
+        'Origin Country': 'USA',
+        'Destination City': cities[destination],
+        'Destination State': city_states[destination],
+        'Destination Zip Code': rng.integers(10000, 99999, rows),
+        'Destination Country': 'USA',
+        'Rate 1': rate_1,
+        'FSC 1': fsc_1,
+        'Total': rate_1 + fsc_1,
+        'Expiration': pd.Timestamp('2025-01-01') + pd.to_timedelta(rng.integers(0, 365, rows), unit='D'),
+    })
+
+
+def make_queries(sheet, count, seed=1):
+    """
+    Build form payloads for /search. Hits are sampled from real rows, so
+    popular lanes are queried more often, as they would be in practice.
+    """
+    rng = np.random.default_rng(seed)
+    shapes = rng.choice(list(QUERY_MIX), size=count, p=list(QUERY_MIX.values()))
+    rows = sheet.iloc[rng.integers(0, len(sheet), count)].to_dict(orient='records')
+    queries = []
+    for shape, row in zip(shapes, rows):
+        if shape == 'lane':
+            query = {'origin_city': row['Origin City'], 'origin_state': row['Origin State'],
+                     'destination_city': row['Destination City'], 'destination_state': row['Destination State']}
+        elif shape == 'origin_carrier':
+            query = {'origin_city': row['Origin City'], 'origin_state': row['Origin State'],
+                     'carrier': row['Carrier']}
+        elif shape == 'destination':
+            query = {'destination_city': row['Destination City'], 'destination_state': row['Destination State']}
+        elif shape == 'carrier_mode':
+            query = {'carrier': row['Carrier'], 'mode': row['Mode']}
+        else:
+            query = {'origin_city': f"Nowhere {rng.integers(1000)}", 'origin_state': row['Origin State']}
+        # Users type in any case with stray spaces
+        queries.append({k: f" {v.lower()} " if rng.random() < 0.2 else v for k, v in query.items()})
+    return queries
+
+
+def run_in_process(sheet_path, queries):
+    os.environ['RATES_FILE'] = sheet_path
+    import rates
+
+    client = rates.app.test_client()
+    latencies = []
+    start = time.perf_counter()
+    for query in queries:
+        t = time.perf_counter()
+        response = client.post('/search', data=query)
+        latencies.append(time.perf_counter() - t)
+        if response.status_code != 200:
+            raise RuntimeError(f"/search returned {response.status_code}")
+    wall = time.perf_counter() - start
+    return latencies, wall, client.get('/metrics').get_json()
+
+
+def run_against_server(url, queries, concurrency):
+    url = url.rstrip('/')
+
+    def send(query):
+        body = urllib.parse.urlencode(query).encode()
+        t = time.perf_counter()
+        with urllib.request.urlopen(url + '/search', data=body, timeout=30) as response:
+            response.read()
+        return time.perf_counter() - t
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        latencies = list(pool.map(send, queries))
+    wall = time.perf_counter() - start
+    with urllib.request.urlopen(url + '/metrics', timeout=30) as response:
+        server_metrics = json.load(response)
+    return latencies, wall, server_metrics
+
+
+def print_report(latencies, wall, server_metrics):
+    ms = np.array(latencies) * 1000
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+    print(f"{len(ms)} requests in {wall:.2f}s: {len(ms) / wall:.1f} req/s")
+    print(f"latency ms: p50 {p50:.2f}  p95 {p95:.2f}  p99 {p99:.2f}  max {ms.max():.2f}")
+
+    search = server_metrics.get('endpoints', {}).get('search')
+    if search:
+        print(f"server: {search['requests']} searches, {search['mean_result_rows']:.1f} rows/result")
+        for stage, stats in search['stages'].items():
+            print(f"  {stage:<7} mean {stats['mean_ms']:.2f}  p50 {stats['p50_ms']:.2f}  "
+                  f"p95 {stats['p95_ms']:.2f}  p99 {stats['p99_ms']:.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the rates app with a synthetic rate sheet.")
+    parser.add_argument("--rows", type=int, default=100000, help="Lanes in the synthetic rate sheet.")
+    parser.add_argument("--requests", type=int, default=2000, help="Number of /search requests to send.")
+    parser.add_argument("--sheet", default=None,
+                        help="Where to write the synthetic sheet (.parquet, .csv or .xlsx); an existing .parquet is reused.")
+    parser.add_argument("--url", default=None, help="Drive a running server instead of the in-process test client.")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent clients when using --url.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--generate-only", action="store_true", help="Write the sheet and exit.")
+    args = parser.parse_args()
+
+    sheet_path = args.sheet or os.path.join(tempfile.gettempdir(), f"rates_{args.rows}.parquet")
+    if os.path.exists(sheet_path) and sheet_path.endswith('.parquet'):
+        sheet = pd.read_parquet(sheet_path)
+    else:
+        sheet = generate_sheet(args.rows, args.seed)
+        if sheet_path.endswith('.parquet'):
+            sheet.to_parquet(sheet_path, index=False)
+        elif sheet_path.endswith('.csv'):
+            sheet.to_csv(sheet_path, index=False)
+        else:
+            sheet.to_excel(sheet_path, index=False)
+        print(f"Wrote {len(sheet)} synthetic lanes to {sheet_path}")
+    if args.generate_only:
+        return
+
+    queries = make_queries(sheet, args.requests, args.seed + 1)
+    if args.url:
+        results = run_against_server(args.url, queries, args.concurrency)
+    else:
+        results = run_in_process(sheet_path, queries)
+    print_report(*results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Per-request timing for the rates app.
+
+Each endpoint records how long filtering and rendering took and how many
+rows it returned. Counters and totals cover the whole process lifetime;
+percentiles come from a window of the most recent requests so memory stays
+bounded. Exposed as JSON on /metrics.
+"""
+
+import threading
+from collections import deque
+
+import numpy as np
+
+WINDOW = 2048
+
+
+class EndpointStats:
+    def __init__(self):
+        self.count = 0
+        self.totals = {}
+        self.result_rows = 0
+        self.recent = {}
+
+    def record(self, timings, results):
+        self.count += 1
+        self.result_rows += results
+        for stage, seconds in timings.items():
+            self.totals[stage] = self.totals.get(stage, 0.0) + seconds
+            self.recent.setdefault(stage, deque(maxlen=WINDOW)).append(seconds)
+
+    def snapshot(self):
+        stages = {}
+        for stage, total in self.totals.items():
+            recent = np.fromiter(self.recent[stage], dtype=float) * 1000
+            p50, p95, p99 = np.percentile(recent, [50, 95, 99])
+            stages[stage] = {
+                'mean_ms': total / self.count * 1000,
+                'p50_ms': p50,
+                'p95_ms': p95,
+                'p99_ms': p99,
+            }
+        return {
+            'requests': self.count,
+            'mean_result_rows': self.result_rows / self.count if self.count else 0.0,
+            'stages': stages,
+        }
+
+
+class RequestMetrics:
+    def __init__(self):
+        self._endpoints = {}
+        self._lock = threading.Lock()
+
+    def record(self, endpoint, results=0, **timings):
+        """
+        record('search', results=12, filter=0.001, render=0.004)
+        Timings are in seconds; a 'total' stage is added automatically.
+        """
+        timings['total'] = sum(timings.values())
+        with self._lock:
+            self._endpoints.setdefault(endpoint, EndpointStats()).record(timings, results)
+
+    def snapshot(self):
+        with self._lock:
+            return {endpoint: stats.snapshot() for endpoint, stats in self._endpoints.items()}
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
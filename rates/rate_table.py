@@ -0,0 +1,165 @@
+"""
+Indexed in-memory rate table.
+
+The key columns are normalized (stripped, lowercased) once at load time and
+factorized into integer codes. Hash indexes map each code (and each
+city/state pair) to the row positions holding it, so a search starts from
+the smallest matching index bucket and only compares codes on those rows
+instead of re-lowercasing every column of the whole sheet per request.
+"""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+KEY_COLUMNS = ['Origin City', 'Origin State', 'Destination City', 'Destination State', 'Carrier', 'Mode']
+
+# Composite indexes for the lanes users usually search by
+PAIR_INDEXES = [
+    ('Origin City', 'Origin State'),
+    ('Destination City', 'Destination State'),
+]
+
+EMPTY_ROWS = np.empty(0, dtype=np.int64)
+
+
+def normalize(value):
+    return str(value).strip().lower()
+
+
+def _bucket_index(frame, columns):
+    # {code or tuple of codes: sorted row positions}
+    return {key: rows.astype(np.int64) for key, rows in frame.groupby(columns, sort=False).indices.items()}
+
+
+class RateTable:
+    def __init__(self, data):
+        self.data = data.reset_index(drop=True)
+        self.codes = {}
+        self.lookup = {}
+
+        for column in KEY_COLUMNS:
+            values = self.data[column]
+            normalized = values.where(values.isna(), values.astype(str).str.strip().str.lower())
+            # Missing cells get code -1 and can never match a search term
+            codes, uniques = pd.factorize(normalized)
+            self.codes[column] = codes.astype(np.int32)
+            self.lookup[column] = {value: code for code, value in enumerate(uniques)}
+
+        code_frame = pd.DataFrame(self.codes)
+        self.indexes = {(column,): _bucket_index(code_frame, column) for column in KEY_COLUMNS}
+        for columns in PAIR_INDEXES:
+            self.indexes[columns] = _bucket_index(code_frame, list(columns))
+
+    def __len__(self):
+        return len(self.data)
+
+    def match_rows(self, criteria):
+        """
+        Return the row positions matching every non-empty criterion.
+        criteria maps key column -> already normalized search value.
+        """
+        wanted = {}
+        for column, value in criteria.items():
+            if not value:
+                continue
+            code = self.lookup[column].get(value)
+            if code is None:
+                return EMPTY_ROWS
+            wanted[column] = code
+
+        if not wanted:
+            return np.arange(len(self.data), dtype=np.int64)
+
+        # Start from the smallest index bucket that covers part of the query
+        best_rows, best_columns = None, ()
+        for columns, index in self.indexes.items():
+            if not all(column in wanted for column in columns):
+                continue
+            key = wanted[columns[0]] if len(columns) == 1 else tuple(wanted[c] for c in columns)
+            rows = index.get(key, EMPTY_ROWS)
+            if best_rows is None or len(rows) < len(best_rows):
+                best_rows, best_columns = rows, columns
+            if not len(rows):
+                return EMPTY_ROWS
+
+        rows = best_rows
+        for column, code in wanted.items():
+            if column in best_columns:
+                continue
+            rows = rows[self.codes[column][rows] == code]
+            if not len(rows):
+                break
+        return rows
+
+    def search(self, criteria):
+        """
+        Return the DataFrame of rows matching criteria (see match_rows).
+        """
+        return self.data.iloc[self.match_rows(criteria)]
+
+
+def format_expiration(values):
+    """
+    Format a column of expiration dates as MM-DD-YYYY in one vectorized pass.
+    Each value is parsed on its own (format='mixed'), as the old per-row code
+    did, so one column can mix '2025-03-07' and '03/07/2025'. Missing values
+    are kept as they were; values that are not dates become "Invalid Date".
+    """
+    parsed = pd.to_datetime(values, errors='coerce', format='mixed')
+    formatted = parsed.dt.strftime("%m-%d-%Y").astype(object)
+    formatted[values.notna() & parsed.isna()] = "Invalid Date"
+    missing = values.isna()
+    formatted[missing] = values[missing]
+    return formatted
+
+
+def to_records(frame, json_safe=True):
+    """
+    Rows as dicts with Expiration formatted. json_safe turns missing cells
+    into None for JSON; the HTML page keeps them as they are (shown as nan).
+    """
+    frame = frame.copy()
+    if 'Expiration' in frame:
+        frame['Expiration'] = format_expiration(frame['Expiration'])
+    if json_safe:
+        frame = frame.astype(object).where(frame.notna(), None)
+    return frame.to_dict(orient='records')
+
+
+class QueryCache:
+    """
+    Small thread-safe LRU cache for query responses.
+    """
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
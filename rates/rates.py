@@ -1,16 +1,48 @@
-from flask import Flask, render_template, request
-import pandas as pd
-from datetime import datetime
+from flask import Flask, render_template, request, jsonify
+import math
 import os
+import time
+from autocomplete import AUTOCOMPLETE_FIELDS, TOP_K, Autocompleter
+from loader import RatesStore
+from metrics import RequestMetrics
+from rate_table import QueryCache, to_records
 
 app = Flask(__name__)
 
-# Load rates from an Excel file. Ensure the file exists.
-rates_file = "/Users/joshuabrooks/Desktop/PythonProjectsPublic/rates/rates.xlsx"
-if not os.path.exists(rates_file):
-    raise FileNotFoundError(f"Rates file not found: {rates_file}")
+# Load rates from an Excel file (RATES_FILE, default rates.xlsx next to this script).
+# The sheet is cached as Parquet and reloaded in the background when it changes.
+rates_file = os.environ.get("RATES_FILE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "rates.xlsx"))
+rates_store = RatesStore(rates_file, os.environ.get("RATES_CACHE_DIR"))
+rates_store.start_watching(float(os.environ.get("RATES_RELOAD_INTERVAL", 5)))
 
-rates_data = pd.read_excel(rates_file)
+# Cached /api/rates responses; dropped whenever the rate sheet is reloaded
+query_cache = QueryCache(maxsize=int(os.environ.get("RATES_QUERY_CACHE_SIZE", 1024)))
+rates_store.on_reload.append(lambda store: query_cache.clear())
+
+API_DEFAULT_LIMIT = 50
+API_MAX_LIMIT = 500
+
+# Prefix indexes for autocomplete, rebuilt with each reload
+autocompleter = Autocompleter(rates_store.table)
+
+def rebuild_autocomplete(store):
+    global autocompleter
+    autocompleter = Autocompleter(store.table)
+
+rates_store.on_reload.append(rebuild_autocomplete)
+
+# Per-request filter/render timings, served on /metrics
+request_metrics = RequestMetrics()
+
+# Search form field -> rate sheet column
+FORM_FIELDS = {
+    'origin_city': 'Origin City',
+    'origin_state': 'Origin State',
+    'destination_city': 'Destination City',
+    'destination_state': 'Destination State',
+    'carrier': 'Carrier',
+    'mode': 'Mode',
+}
 
 @app.route('/')
 def index():
@@ -19,33 +51,116 @@ def index():
 @app.route('/search', methods=['POST'])
 def search():
     # Extract search parameters from the form
-    origin_city = request.form.get('origin_city', '').strip().lower()
-    origin_state = request.form.get('origin_state', '').strip().lower()
-    destination_city = request.form.get('destination_city', '').strip().lower()
-    destination_state = request.form.get('destination_state', '').strip().lower()
-    carrier = request.form.get('carrier', '').strip().lower()
-    mode = request.form.get('mode', '').strip().lower()
-
-    # Filter the data
-    filtered_data = rates_data[
-        (rates_data['Origin City'].str.lower().str.strip() == origin_city if origin_city else True) &
-        (rates_data['Origin State'].str.lower().str.strip() == origin_state if origin_state else True) &
-        (rates_data['Destination City'].str.lower().str.strip() == destination_city if destination_city else True) &
-        (rates_data['Destination State'].str.lower().str.strip() == destination_state if destination_state else True) &
-        (rates_data['Carrier'].str.lower().str.strip() == carrier if carrier else True) &
-        (rates_data['Mode'].str.lower().str.strip() == mode if mode else True)
-    ]
+    criteria = {
+        column: request.form.get(field, '').strip().lower()
+        for field, column in FORM_FIELDS.items()
+    }
+
+    # Filter the data through the prebuilt indexes
+    start = time.perf_counter()
+    filtered_data = rates_store.table.search(criteria)
+    filtered = time.perf_counter()
 
     # Format expiration date
-    results = filtered_data.to_dict(orient='records')
-    for result in results:
-        if 'Expiration' in result and pd.notnull(result['Expiration']):
-            try:
-                result['Expiration'] = pd.to_datetime(result['Expiration']).strftime("%m-%d-%Y")
-            except ValueError:
-                result['Expiration'] = "Invalid Date"
-
-    return render_template('index.html', results=results)
+    results = to_records(filtered_data, json_safe=False)
+
+    page = render_template('index.html', results=results)
+    request_metrics.record('search', results=len(results),
+                           filter=filtered - start, render=time.perf_counter() - filtered)
+    return page
+
+@app.route('/api/rates', methods=['GET'])
+def api_rates():
+    """
+    JSON search. Query parameters: the search form fields, page, limit,
+    sort (column name, prefix with '-' for descending) and fields
+    (comma-separated columns to return).
+    """
+    args = request.args
+    criteria = {
+        column: args.get(field, '').strip().lower()
+        for field, column in FORM_FIELDS.items()
+    }
+    try:
+        page = max(int(args.get('page', 1)), 1)
+        limit = min(max(int(args.get('limit', API_DEFAULT_LIMIT)), 1), API_MAX_LIMIT)
+    except ValueError:
+        return jsonify(error="page and limit must be integers"), 400
+    sort = args.get('sort', '').strip()
+    fields = tuple(f.strip() for f in args.get('fields', '').split(',') if f.strip())
+
+    start = time.perf_counter()
+    version, table = rates_store.current
+    key = (version, tuple(sorted(criteria.items())), sort, fields, page, limit)
+    payload = query_cache.get(key)
+    if payload is not None:
+        response = jsonify(payload)
+        request_metrics.record('api_rates_cached', results=len(payload['results']),
+                               render=time.perf_counter() - start)
+        return response
+
+    columns = table.data.columns
+    sort_column = sort.lstrip('-')
+    unknown = [f for f in fields + ((sort_column,) if sort_column else ()) if f not in columns]
+    if unknown:
+        return jsonify(error=f"Unknown column(s): {', '.join(unknown)}"), 400
+
+    filtered_data = table.search(criteria)
+    if sort_column:
+        filtered_data = filtered_data.sort_values(sort_column, ascending=not sort.startswith('-'),
+                                                  kind='stable', na_position='last')
+    total = len(filtered_data)
+    page_data = filtered_data.iloc[(page - 1) * limit:page * limit]
+    if fields:
+        page_data = page_data[list(fields)]
+    filtered = time.perf_counter()
+
+    payload = {
+        'total': total,
+        'page': page,
+        'limit': limit,
+        'pages': math.ceil(total / limit),
+        'results': to_records(page_data),
+    }
+    query_cache.put(key, payload)
+    response = jsonify(payload)
+    request_metrics.record('api_rates', results=len(payload['results']),
+                           filter=filtered - start, render=time.perf_counter() - filtered)
+    return response
+
+@app.route('/api/autocomplete', methods=['GET'])
+def api_autocomplete():
+    """
+    Ranked suggestions for field (origin_city, destination_city, carrier
+    or mode) starting with q, falling back to near matches for typos.
+    """
+    field = request.args.get('field', '')
+    if field not in AUTOCOMPLETE_FIELDS:
+        return jsonify(error=f"field must be one of: {', '.join(AUTOCOMPLETE_FIELDS)}"), 400
+    query = request.args.get('q', '')
+    try:
+        limit = max(int(request.args.get('limit', TOP_K)), 1)
+    except ValueError:
+        return jsonify(error="limit must be an integer"), 400
+
+    start = time.perf_counter()
+    suggestions, fuzzy = autocompleter.suggest(field, query, limit)
+    request_metrics.record('autocomplete', results=len(suggestions), filter=time.perf_counter() - start)
+    return jsonify(
+        field=field,
+        query=query,
+        fuzzy=fuzzy,
+        suggestions=[{'value': value, 'count': count} for value, count in suggestions],
+    )
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    version, table = rates_store.current
+    return jsonify(
+        endpoints=request_metrics.snapshot(),
+        rates={'version': version, 'rows': len(table)},
+        query_cache={'size': len(query_cache), 'hits': query_cache.hits, 'misses': query_cache.misses},
+    )
 
 if __name__ == '__main__':
     PORT = int(os.environ.get("PORT", 5000))
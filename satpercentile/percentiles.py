@@ -0,0 +1,125 @@
+"""
+SAT score -> percentile lookups.
+
+The anchor table is turned once into sorted NumPy arrays. A single score is
+looked up with bisect and a batch with np.searchsorted. By default a score
+gets the percentile of the highest anchor at or below it (0 below the
+lowest anchor); with interpolate=True, scores between anchors are placed
+linearly between their percentiles.
+
+Usage:
+    python percentiles.py students.csv scored.csv --column score --interpolate
+"""
+
+import argparse
+import time
+from bisect import bisect_right
+
+import numpy as np
+import pandas as pd
+
+MIN_SCORE, MAX_SCORE = 0, 1600
+
+# Sample percentile data for illustration
+percentile_data = {
+    1600: 99,
+    1550: 99,
+    1500: 98,
+    1450: 97,
+    1400: 95,
+    1350: 92,
+    1300: 88,
+    1250: 82,
+    1200: 74,
+    1150: 65,
+    1100: 55,
+    1050: 45,
+    1000: 35,
+    950: 25,
+    900: 15,
+    850: 10,
+    800: 5,
+    750: 2,
+    700: 1
+}
+
+
+class PercentileTable:
+    def __init__(self, data):
+        anchors = sorted(data.items())
+        self.scores = np.array([score for score, _ in anchors], dtype=np.float64)
+        self.percentiles = np.array([percentile for _, percentile in anchors], dtype=np.float64)
+        # Original values for single lookups, so 74 stays 74 rather than 74.0
+        self._score_list = [score for score, _ in anchors]
+        self._percentile_list = [percentile for _, percentile in anchors]
+
+    def percentile(self, score, interpolate=False):
+        """
+        Percentile for one score (assumed valid; see valid_scores). The
+        table's own value (an int here) unless interpolate, which gives a float.
+        """
+        i = bisect_right(self._score_list, score)
+        if not interpolate:
+            return self._percentile_list[i - 1] if i else 0
+        if i == 0:
+            return 0.0
+        if i == len(self._score_list):
+            return float(self._percentile_list[-1])
+        low, high = self._score_list[i - 1], self._score_list[i]
+        p_low, p_high = self._percentile_list[i - 1], self._percentile_list[i]
+        return p_low + (p_high - p_low) * (score - low) / (high - low)
+
+    def percentiles_for(self, scores, interpolate=False):
+        """
+        Percentiles for an array of scores; NaN for missing or out-of-range scores.
+        """
+        scores = np.asarray(scores, dtype=np.float64)
+        if interpolate:
+            result = np.interp(scores, self.scores, self.percentiles, left=0.0)
+        else:
+            i = np.searchsorted(self.scores, scores, side='right')
+            result = np.where(i > 0, self.percentiles[np.maximum(i - 1, 0)], 0.0)
+        return np.where(valid_scores(scores), result, np.nan)
+
+
+def valid_scores(scores):
+    scores = np.asarray(scores, dtype=np.float64)
+    return (scores >= MIN_SCORE) & (scores <= MAX_SCORE)
+
+
+table = PercentileTable(percentile_data)
+
+
+def find_percentile(score, interpolate=False):
+    return table.percentile(score, interpolate)
+
+
+def score_csv(input_path, output_path, column='score', interpolate=False):
+    """
+    Add a percentile column to a CSV of students. Returns (rows, invalid scores).
+    """
+    students = pd.read_csv(input_path)
+    scores = pd.to_numeric(students[column], errors='coerce').to_numpy(dtype=np.float64)
+    students['percentile'] = table.percentiles_for(scores, interpolate)
+    students.to_csv(output_path, index=False)
+    return len(students), int(np.count_nonzero(~valid_scores(scores)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Add SAT percentiles to a CSV of students.")
+    parser.add_argument("input", help="CSV with a score column.")
+    parser.add_argument("output", help="Where to write the CSV with a percentile column added.")
+    parser.add_argument("--column", default="score", help="Column holding the SAT scores.")
+    parser.add_argument("--interpolate", action="store_true",
+                        help="Interpolate between table scores instead of using the next one down.")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    rows, invalid = score_csv(args.input, args.output, args.column, args.interpolate)
+    print(f"Scored {rows:,} students in {time.perf_counter() - start:.1f}s -> {args.output}")
+    if invalid:
+        print(f"{invalid:,} missing or out-of-range scores left blank")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+Bulk SSN screening.
+
+Streams one column of SSNs from a CSV or Parquet file in chunks. Each chunk
+is validated and classified with whole-array NumPy operations: the strings
+are viewed as a fixed-width code-point matrix, the dashes and digits are
+checked column by column, and areas are looked up in the 1000-entry table
+from ssnpre2011born. Results are written chunk by chunk to CSV or Parquet
+(picked by extension) with these columns:
+
+    ssn, status, area, group, serial, state, post_2011
+
+status is 'ok', 'bad_format', 'area_not_issued', 'group_zero' or
+'serial_zero'. post_2011 marks areas that were unassigned before 2011, so
+the number must have been issued after randomization.
+
+Usage:
+    python ssn_bulk.py records.csv screened.parquet --column ssn
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from ssnpre2011born import AREA_STATES, UNASSIGNED
+
+STATUSES = ['ok', 'bad_format', 'area_not_issued', 'group_zero', 'serial_zero']
+OK, BAD_FORMAT, AREA_NOT_ISSUED, GROUP_ZERO, SERIAL_ZERO = range(len(STATUSES))
+
+STATE_NAMES = sorted({state for state in AREA_STATES if state is not None})
+# Area -> index into STATE_NAMES, -1 where the area was never issued
+AREA_CODES = np.array([-1 if state is None else STATE_NAMES.index(state) for state in AREA_STATES], dtype=np.int16)
+UNASSIGNED_CODE = STATE_NAMES.index(UNASSIGNED)
+
+DIGIT_POSITIONS = [0, 1, 2, 4, 5, 7, 8, 9, 10]
+DASH_POSITIONS = [3, 6]
+
+
+def classify(ssns):
+    """
+    Classify an array of 'XXX-XX-XXXX' strings. Returns a DataFrame with the
+    columns described above (ssn excluded); missing values count as bad_format.
+    """
+    # Stripped like get_state_from_ssn does; then 12 wide, so anything longer
+    # than 11 characters leaves a non-zero 12th code point
+    values = pd.Series(ssns, dtype=object).fillna('').astype(str).str.strip().to_numpy(dtype='U12')
+    codes = values.view(np.uint32).reshape(len(values), 12)
+
+    digits = codes[:, DIGIT_POSITIONS] - ord('0')  # non-digits wrap around to large values
+    well_formed = (digits <= 9).all(axis=1) & (codes[:, DASH_POSITIONS] == ord('-')).all(axis=1) & (codes[:, 11] == 0)
+    digits = np.where(well_formed[:, None], digits, 0).astype(np.int16)
+
+    area = digits[:, 0] * 100 + digits[:, 1] * 10 + digits[:, 2]
+    group = digits[:, 3] * 10 + digits[:, 4]
+    serial = digits[:, 5] * 1000 + digits[:, 6] * 100 + digits[:, 7] * 10 + digits[:, 8]
+    state_codes = AREA_CODES[area]
+
+    status = np.full(len(values), OK, dtype=np.int8)
+    status[serial == 0] = SERIAL_ZERO
+    status[group == 0] = GROUP_ZERO
+    status[state_codes < 0] = AREA_NOT_ISSUED
+    status[~well_formed] = BAD_FORMAT
+
+    ok = status == OK
+    state_codes = np.where(ok, state_codes, -1)
+    return pd.DataFrame({
+        'status': pd.Categorical.from_codes(status, STATUSES),
+        # <NA> where the SSN couldn't be parsed
+        'area': pd.arrays.IntegerArray(area, ~well_formed),
+        'group': pd.arrays.IntegerArray(group, ~well_formed),
+        'serial': pd.arrays.IntegerArray(serial, ~well_formed),
+        'state': pd.Categorical.from_codes(state_codes, STATE_NAMES),
+        'post_2011': ok & (state_codes == UNASSIGNED_CODE),
+    })
+
+
+def read_chunks(path, column, chunk_size):
+    """
+    Yields arrays of SSN strings from a CSV or Parquet column.
+    """
+    if path.endswith('.parquet'):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Parquet input needs pyarrow: pip install pyarrow")
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size, columns=[column]):
+            yield batch.column(0).to_numpy(zero_copy_only=False)
+    else:
+        # As strings, so leading zeros survive
+        for chunk in pd.read_csv(path, usecols=[column], dtype=str, keep_default_na=False, chunksize=chunk_size):
+            yield chunk[column].to_numpy()
+
+
+class ResultWriter:
+    """
+    Appends classified chunks to a CSV or Parquet file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.parquet = path.endswith('.parquet')
+        self.writer = None
+        self.rows = 0
+        if self.parquet:
+            try:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+            except ImportError:
+                raise ImportError("Parquet output needs pyarrow: pip install pyarrow")
+            self.pa, self.pq = pa, pq
+
+    def write(self, frame):
+        if self.parquet:
+            table = self.pa.Table.from_pandas(frame, preserve_index=False)
+            if self.writer is None:
+                self.writer = self.pq.ParquetWriter(self.path, table.schema)
+            self.writer.write_table(table)
+        else:
+            frame.to_csv(self.path, mode='w' if self.rows == 0 else 'a', header=self.rows == 0, index=False)
+        self.rows += len(frame)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+def screen_file(input_path, output_path, column='ssn', chunk_size=1_000_000):
+    """
+    Classify every SSN in input_path and write the results. Returns counts per status.
+    """
+    counts = np.zeros(len(STATUSES), dtype=np.int64)
+    post_2011 = 0
+    writer = ResultWriter(output_path)
+    try:
+        for ssns in read_chunks(input_path, column, chunk_size):
+            result = classify(ssns)
+            result.insert(0, 'ssn', ssns)
+            writer.write(result)
+            counts += np.bincount(result['status'].cat.codes, minlength=len(STATUSES))
+            post_2011 += int(result['post_2011'].sum())
+    finally:
+        writer.close()
+    summary = dict(zip(STATUSES, counts.tolist()))
+    summary['post_2011'] = post_2011
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate and classify a file of SSNs by issuing state.")
+    parser.add_argument("input", help="CSV or Parquet file.")
+    parser.add_argument("output", help="Results file; .parquet for Parquet, anything else is CSV.")
+    parser.add_argument("--column", default="ssn", help="Column holding the SSNs.")
+    parser.add_argument("--chunk-size", type=int, default=1_000_000, help="Rows classified at a time.")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    summary = screen_file(args.input, args.output, args.column, args.chunk_size)
+    total = sum(summary[status] for status in STATUSES)
+    print(f"Screened {total:,} SSNs in {time.perf_counter() - start:.1f}s -> {args.output}")
+    for name, count in summary.items():
+        print(f"  {name}: {count:,}")
+
+
+if __name__ == "__main__":
+    main()
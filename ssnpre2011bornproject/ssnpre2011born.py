@@ -1,101 +1,164 @@
-# Full mapping of SSN area numbers to states
+UNASSIGNED = "Unassigned (before 2011)"
+
+# Full mapping of SSN area numbers to states (SSA allocations before randomization in June 2011).
+# Areas 000, 666 and 900-999 were never issued and are left out.
 area_to_state = {
     range(1, 4): "New Hampshire",
     range(4, 8): "Maine",
     range(8, 10): "Vermont",
     range(10, 35): "Massachusetts",
-    range(35, 39): "Rhode Island",
-    range(39, 50): "Connecticut",
+    range(35, 40): "Rhode Island",
+    range(40, 50): "Connecticut",
     range(50, 135): "New York",
     range(135, 159): "New Jersey",
-    range(159, 211): "Pennsylvania",
-    range(212, 220): "Maryland",
-    range(220, 222): "Delaware",
-    range(222, 233): "Virginia",
-    range(232, 236): "West Virginia",
-    range(236, 247): "North Carolina",
-    range(247, 251): "South Carolina",
-    range(251, 267): "Georgia",
-    range(267, 302): "Florida",
-    range(303, 317): "Ohio",
-    range(318, 361): "Indiana",
-    range(362, 386): "Illinois",
-    range(387, 399): "Michigan",
-    range(400, 407): "Wisconsin",
-    range(408, 415): "Kentucky",
-    range(416, 424): "Tennessee",
-    range(425, 428): "Alabama",
-    range(429, 432): "Mississippi",
-    range(433, 439): "Arkansas",
-    range(440, 448): "Louisiana",
-    range(449, 467): "Oklahoma",
-    range(468, 477): "Texas",
-    range(478, 485): "Minnesota",
-    range(486, 500): "Iowa",
-    range(501, 502): "North Dakota",
-    range(503, 504): "South Dakota",
-    range(505, 508): "Nebraska",
-    range(509, 515): "Kansas",
-    range(516, 517): "Montana",
-    range(518, 519): "Idaho",
-    range(520, 520): "Wyoming",
-    range(521, 524): "Colorado",
-    range(525, 525): "New Mexico",
-    range(526, 527): "Arizona",
-    range(528, 529): "Utah",
-    range(530, 530): "Nevada",
-    range(531, 539): "Washington",
-    range(540, 544): "Oregon",
-    range(545, 573): "California",
-    range(574, 574): "Alaska",
-    range(575, 576): "Hawaii",
-    range(577, 579): "District of Columbia",
-    range(580, 580): "Virgin Islands",
-    range(581, 584): "Puerto Rico",
-    range(585, 585): "Guam",
-    range(586, 586): "American Samoa",
-    range(587, 665): "Unassigned (before 2011)",
-    range(667, 699): "Unassigned (before 2011)",
-    range(700, 728): "Railroad Board (pre-1963)",
-    range(729, 999): "Unassigned (before 2011)"
+    range(159, 212): "Pennsylvania",
+    range(212, 221): "Maryland",
+    range(221, 223): "Delaware",
+    range(223, 232): "Virginia",
+    range(232, 233): "West Virginia or North Carolina",
+    range(233, 237): "West Virginia",
+    range(237, 247): "North Carolina",
+    range(247, 252): "South Carolina",
+    range(252, 261): "Georgia",
+    range(261, 268): "Florida",
+    range(268, 303): "Ohio",
+    range(303, 318): "Indiana",
+    range(318, 362): "Illinois",
+    range(362, 387): "Michigan",
+    range(387, 400): "Wisconsin",
+    range(400, 408): "Kentucky",
+    range(408, 416): "Tennessee",
+    range(416, 425): "Alabama",
+    range(425, 429): "Mississippi",
+    range(429, 433): "Arkansas",
+    range(433, 440): "Louisiana",
+    range(440, 449): "Oklahoma",
+    range(449, 468): "Texas",
+    range(468, 478): "Minnesota",
+    range(478, 486): "Iowa",
+    range(486, 501): "Missouri",
+    range(501, 503): "North Dakota",
+    range(503, 505): "South Dakota",
+    range(505, 509): "Nebraska",
+    range(509, 516): "Kansas",
+    range(516, 518): "Montana",
+    range(518, 520): "Idaho",
+    range(520, 521): "Wyoming",
+    range(521, 525): "Colorado",
+    range(525, 526): "New Mexico",
+    range(526, 528): "Arizona",
+    range(528, 530): "Utah",
+    range(530, 531): "Nevada",
+    range(531, 540): "Washington",
+    range(540, 545): "Oregon",
+    range(545, 574): "California",
+    range(574, 575): "Alaska",
+    range(575, 577): "Hawaii",
+    range(577, 580): "District of Columbia",
+    range(580, 581): "Virgin Islands or Puerto Rico",
+    range(581, 585): "Puerto Rico",
+    range(585, 586): "New Mexico",
+    range(586, 587): "Guam, American Samoa or Philippine Islands",
+    range(587, 589): "Mississippi",
+    range(589, 596): "Florida",
+    range(596, 600): "Puerto Rico",
+    range(600, 602): "Arizona",
+    range(602, 627): "California",
+    range(627, 646): "Texas",
+    range(646, 648): "Utah",
+    range(648, 650): "New Mexico",
+    range(650, 654): "Colorado",
+    range(654, 659): "South Carolina",
+    range(659, 666): "Louisiana",
+    range(667, 676): "Georgia",
+    range(676, 680): "Arkansas",
+    range(680, 681): "Nevada",
+    range(681, 691): "North Carolina",
+    range(691, 700): "Virginia",
+    range(700, 729): "Railroad Board (pre-1963)",
+    range(729, 734): "Enumeration at Entry",
+    range(734, 750): UNASSIGNED,
+    range(750, 752): "Hawaii",
+    range(752, 756): "Mississippi",
+    range(756, 764): "Tennessee",
+    range(764, 766): "Arizona",
+    range(766, 773): "Florida",
+    range(773, 900): UNASSIGNED,
 }
 
+
+def area_issued(area):
+    return 0 < area < 900 and area != 666
+
+
+def build_area_table(mapping):
+    """
+    Area number (0-999) -> state as a 1000-entry list, None where the area
+    was never issued. Raises ValueError for empty or overlapping ranges and
+    for issued areas no range covers.
+    """
+    table = [None] * 1000
+    for area_range, state in mapping.items():
+        if not area_range:
+            raise ValueError(f"Empty range {area_range} for {state}")
+        for area in area_range:
+            if not area_issued(area):
+                raise ValueError(f"Area {area:03d} was never issued but is mapped to {state}")
+            if table[area] is not None:
+                raise ValueError(f"Area {area:03d} is mapped to both {table[area]} and {state}")
+            table[area] = state
+    missing = [f"{area:03d}" for area in range(1000) if area_issued(area) and table[area] is None]
+    if missing:
+        raise ValueError(f"No state for areas {', '.join(missing)}")
+    return table
+
+
+AREA_STATES = build_area_table(area_to_state)
+
+
+def parse_ssn(ssn):
+    """
+    (area, group, serial) from 'XXX-XX-XXXX', or None if it isn't in that format.
+    """
+    parts = ssn.strip().split('-')
+    if [len(part) for part in parts] != [3, 2, 4] or not all(part.isdigit() for part in parts):
+        return None
+    return int(parts[0]), int(parts[1]), int(parts[2])
+
+
 def get_state_from_ssn(ssn):
     """Infers the state and other details from the SSN."""
     try:
         # Validate and split the SSN into its components
-        parts = ssn.split('-')
-        if len(parts) != 3 or not all(part.isdigit() for part in parts):
+        parsed = parse_ssn(ssn)
+        if parsed is None:
             return "Invalid SSN format. Ensure it is in 'XXX-XX-XXXX' format."
-        
-        # Extract area, group, and serial numbers
-        area_number = int(parts[0])
-        group_number = int(parts[1])
-        serial_number = int(parts[2])
-        
+        area_number, group_number, serial_number = parsed
+        if not area_issued(area_number) or group_number == 0 or serial_number == 0:
+            return "Invalid SSN: area 000, 666 or 900-999, group 00 and serial 0000 are never issued."
+
         # Determine state from area number
-        state = "Unknown"
-        for area_range, state_name in area_to_state.items():
-            if area_number in area_range:
-                state = state_name
-                break
-        
+        state = AREA_STATES[area_number]
+
         # Additional inferences
-        state_message = f"The SSN was likely issued in {state}."
+        if state == UNASSIGNED:
+            state_message = f"Area number {area_number:03d} was not assigned to any state before 2011."
+        else:
+            state_message = f"The SSN was likely issued in {state}."
         group_message = f"Group number (middle digits): {group_number} (used for administrative purposes)."
         serial_message = f"Serial number (last digits): {serial_number} (no specific significance)."
-        
+
         # Randomization notice
         randomization_notice = ""
-        if area_number >= 733 or (area_number in range(587, 666)):
+        if state == UNASSIGNED:
             randomization_notice = (
                 "Note: This SSN may have been issued post-2011, "
                 "and area numbers were randomized. Geographic inferences may not apply."
             )
-        
+
         # Combine results
         return "\n".join([state_message, group_message, serial_message, randomization_notice])
-    
+
     except Exception as e:
         return f"Error processing SSN: {e}"
 
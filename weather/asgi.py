@@ -0,0 +1,21 @@
+"""
+ASGI entry point for the weather app.
+
+Serves the same Flask app under an ASGI server, so it can sit behind
+uvicorn/hypercorn alongside other async services. Upstream fetches still run
+on the backend's thread pool, and /weather/stream sends each resort to the
+client as soon as it is ready.
+
+Usage:
+    pip install asgiref uvicorn
+    uvicorn asgi:asgi_app --port 5000
+"""
+
+try:
+    from asgiref.wsgi import WsgiToAsgi
+except ImportError:
+    raise SystemExit("The ASGI mode needs asgiref: pip install asgiref uvicorn")
+
+from backend import app
+
+asgi_app = WsgiToAsgi(app)
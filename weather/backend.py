@@ -1,29 +1,56 @@
-from flask import Flask, send_from_directory, request, jsonify
-from geopy.distance import geodesic
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+from concurrent.futures import TimeoutError as FutureTimeout
+import json
+import os
+
+from flask import Flask, Response, send_from_directory, request, jsonify, stream_with_context
 import requests
+from requests.adapters import HTTPAdapter
+
+from resorts import ResortCatalog
+from weather_cache import WeatherCache
 
 app = Flask(__name__)
 
-# Sample ski resort data
-ski_resorts = [
-    {"name": "Seven Springs", "latitude": 40.0221, "longitude": -79.2896, "website": "https://www.7springs.com"},
-    {"name": "Hidden Valley", "latitude": 40.0545, "longitude": -79.2513, "website": "https://www.hiddenvalleyresort.com"},
-    {"name": "Laurel Mountain", "latitude": 40.1742, "longitude": -79.1647, "website": "https://www.laurelmountainski.com"},
-]
+API_KEY = os.environ.get("OPENWEATHER_API_KEY", "YOUR API KEY")  # Replace with your OpenWeatherMap API key
+# Point this at a local stub (see stub_openweather.py) to run without the real API
+BASE_URL = os.environ.get("OPENWEATHER_BASE_URL", "http://api.openweathermap.org/data/2.5/onecall")
 
-def fetch_weather(lat, lon):
-    api_key = "YOUR API KEY"  # Replace with your OpenWeatherMap API key
-    base_url = "http://api.openweathermap.org/data/2.5/onecall"
+REQUEST_TIMEOUT = (3.05, 10)  # (connect, read) seconds per upstream call
+ENDPOINT_DEADLINE = 12        # seconds to wait for all resorts before returning partial results
+MAX_WORKERS = 16
+CACHE_TTL = float(os.environ.get("WEATHER_CACHE_TTL", 900))  # seconds a forecast is reused for
+CACHE_DB = os.environ.get("WEATHER_CACHE_DB")                 # optional SQLite file to persist the cache
+RESORTS_FILE = os.environ.get("RESORTS_FILE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "resorts.csv"))
+DEFAULT_RESULTS = 10  # nearest resorts returned when the request doesn't say
+MAX_RESULTS = 50      # upper bound on resorts (and so weather fetches) per request
+
+# One pooled session so upstream connections are reused across requests
+session = requests.Session()
+session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=MAX_WORKERS))
+session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=MAX_WORKERS))
+
+executor = ThreadPoolExecutor(max_workers=MAX_WORKERS)
+
+UNAVAILABLE = {"current": "N/A", "forecast": ["N/A"] * 5}
 
+# Ski resort catalog (name, latitude, longitude, website), indexed for nearest-resort queries
+resort_catalog = ResortCatalog.from_csv(RESORTS_FILE)
+
+def fetch_weather(lat, lon):
     params = {
         "lat": lat,
         "lon": lon,
         "exclude": "minutely,hourly,alerts",
         "units": "imperial",
-        "appid": api_key,
+        "appid": API_KEY,
     }
 
-    response = requests.get(base_url, params=params)
+    try:
+        response = session.get(BASE_URL, params=params, timeout=REQUEST_TIMEOUT)
+    except requests.RequestException as e:
+        print(f"Error: {e}")
+        return UNAVAILABLE
     if response.status_code == 200:
         data = response.json()
         current_weather = f"{data['current']['weather'][0]['description'].capitalize()}, {data['current']['temp']}°F"
@@ -34,32 +61,120 @@ def fetch_weather(lat, lon):
         return {"current": current_weather, "forecast": forecast}
     else:
         print(f"Error: {response.status_code} - {response.text}")
-        return {"current": "N/A", "forecast": ["N/A"] * 5}
+        return UNAVAILABLE
+
+def resort_key(resort):
+    return (round(resort["latitude"], 4), round(resort["longitude"], 4))
+
+def load_weather(key):
+    weather = fetch_weather(*key)
+    # Don't cache failures; the cache keeps serving the last good forecast
+    return None if weather is UNAVAILABLE else weather
+
+weather_cache = WeatherCache(load_weather, ttl=CACHE_TTL, db_path=CACHE_DB, wait_timeout=ENDPOINT_DEADLINE)
+
+def fetch_weather_for_resorts(resorts, deadline=ENDPOINT_DEADLINE):
+    """
+    Weather for every resort, from the shared cache where it is fresh and
+    fetched concurrently otherwise. Resorts whose fetch fails or is still
+    running at the deadline get N/A instead of failing the request.
+    """
+    keys = [resort_key(r) for r in resorts]
+    results = [weather_cache.get(key, block=False) for key in keys]
+    futures = {i: executor.submit(weather_cache.get, key) for i, key in enumerate(keys) if results[i] is None}
+    if futures:
+        wait(futures.values(), timeout=deadline)
+
+    for i, future in futures.items():
+        if future.done() and future.exception() is None:
+            results[i] = future.result()
+        else:
+            future.cancel()
+    return [weather if weather is not None else UNAVAILABLE for weather in results]
 
 @app.route("/")
 def index():
     return send_from_directory(".", "frontend.html")
 
+def nearby_resorts(payload):
+    """
+    Resorts for a /weather request, closest first, as (resort, miles) pairs.
+    The body may set "limit" (default 10) and "radius_miles" to narrow the search.
+    """
+    user_location = payload.get("location")
+    lat, lon = float(user_location["latitude"]), float(user_location["longitude"])
+    limit = max(1, min(int(payload.get("limit", DEFAULT_RESULTS)), MAX_RESULTS))
+
+    if payload.get("radius_miles") is not None:
+        indices, distances = resort_catalog.within(lat, lon, float(payload["radius_miles"]), limit=limit)
+    else:
+        indices, distances = resort_catalog.nearest(lat, lon, limit)
+    return [(resort_catalog.resort(i), distance) for i, distance in zip(indices.tolist(), distances.tolist())]
+
+def resort_result(resort, distance, weather):
+    return {
+        "name": resort["name"],
+        "website": resort["website"],
+        "current_weather": weather["current"],
+        "forecast": weather["forecast"],
+        "distance": round(distance, 2),
+    }
+
 @app.route("/weather", methods=["POST"])
 def get_weather():
-    user_location = request.json.get("location")
-    user_coords = (user_location["latitude"], user_location["longitude"])
-
-    resorts_with_weather = []
-    for resort in ski_resorts:
-        resort_coords = (resort["latitude"], resort["longitude"])
-        distance = geodesic(user_coords, resort_coords).miles
-        weather = fetch_weather(resort["latitude"], resort["longitude"])
-        resorts_with_weather.append({
-            "name": resort["name"],
-            "website": resort["website"],
-            "current_weather": weather["current"],
-            "forecast": weather["forecast"],
-            "distance": round(distance, 2),
-        })
-
-    resorts_with_weather.sort(key=lambda x: x["distance"])
-    return jsonify(resorts_with_weather)
+    nearby = nearby_resorts(request.json)
+
+    # Only the selected resorts are fetched, not the whole catalog
+    weathers = fetch_weather_for_resorts([resort for resort, _ in nearby])
+    return jsonify([resort_result(resort, distance, weather) for (resort, distance), weather in zip(nearby, weathers)])
+
+def stream_weather(nearby, deadline=ENDPOINT_DEADLINE):
+    """
+    Yield (rank, result) for each resort as soon as its weather is ready:
+    cached resorts first, then fetches in completion order. rank is the
+    resort's position by distance. Anything unfinished at the deadline is
+    sent as N/A.
+    """
+    pending = {}
+    for rank, (resort, distance) in enumerate(nearby):
+        weather = weather_cache.get(resort_key(resort), block=False)
+        if weather is not None:
+            yield rank, resort_result(resort, distance, weather)
+        else:
+            pending[executor.submit(weather_cache.get, resort_key(resort))] = rank
+
+    try:
+        for future in as_completed(pending, timeout=deadline):
+            rank = pending.pop(future)
+            weather = future.result() if future.exception() is None else None
+            resort, distance = nearby[rank]
+            yield rank, resort_result(resort, distance, weather or UNAVAILABLE)
+    except FutureTimeout:
+        pass
+    for future, rank in pending.items():
+        future.cancel()
+        resort, distance = nearby[rank]
+        yield rank, resort_result(resort, distance, UNAVAILABLE)
+
+@app.route("/weather/stream", methods=["POST"])
+def get_weather_stream():
+    """
+    Same resorts as /weather, streamed as NDJSON: one {"rank": n, ...} object
+    per line as each resort's weather arrives, so the first results don't wait
+    on the slowest upstream call.
+    """
+    nearby = nearby_resorts(request.json)
+
+    def generate():
+        for rank, result in stream_weather(nearby):
+            yield json.dumps({"rank": rank, **result}) + "\n"
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="application/x-ndjson",
+        # Stop proxies from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 if __name__ == "__main__":
     app.run(debug=True)
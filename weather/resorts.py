@@ -0,0 +1,155 @@
+"""
+Ski resort catalog with a nearest-resort index.
+
+Resorts are loaded from a CSV (name, latitude, longitude, website) into NumPy
+arrays. Each resort is also stored as a unit vector on the sphere, bucketed
+into a uniform 3D grid of cells. A nearest/within-radius query only looks at
+cells in growing shells around the user's cell, and stops as soon as no
+unvisited cell could hold anything closer. Working in 3D means there are no
+special cases at the poles or the date line.
+
+Distances returned are great-circle (haversine) miles.
+"""
+
+import csv
+from functools import lru_cache
+
+import numpy as np
+
+EARTH_RADIUS_MILES = 3958.8
+CELL_SIZE = 0.02  # chord length per cell edge, about 80 miles on the ground
+
+
+def unit_vectors(latitudes, longitudes):
+    lat = np.radians(np.asarray(latitudes, dtype=float))
+    lon = np.radians(np.asarray(longitudes, dtype=float))
+    cos_lat = np.cos(lat)
+    return np.stack([cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)], axis=-1)
+
+
+def haversine_miles(lat, lon, latitudes, longitudes):
+    """
+    Great-circle miles from one point to arrays of points.
+    """
+    lat1, lon1 = np.radians(lat), np.radians(lon)
+    lat2, lon2 = np.radians(latitudes), np.radians(longitudes)
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_MILES * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+@lru_cache(maxsize=64)
+def shell_offsets(radius):
+    # Cell offsets exactly `radius` cells away (Chebyshev distance)
+    span = np.arange(-radius, radius + 1)
+    offsets = np.stack(np.meshgrid(span, span, span, indexing="ij"), axis=-1).reshape(-1, 3)
+    if radius:
+        offsets = offsets[np.abs(offsets).max(axis=1) == radius]
+    return offsets
+
+
+class ResortCatalog:
+    def __init__(self, names, latitudes, longitudes, websites, cell_size=CELL_SIZE):
+        self.names = np.asarray(names, dtype=object)
+        self.latitudes = np.asarray(latitudes, dtype=float)
+        self.longitudes = np.asarray(longitudes, dtype=float)
+        self.websites = np.asarray(websites, dtype=object)
+        self.vectors = unit_vectors(self.latitudes, self.longitudes)
+
+        self.cell_size = cell_size
+        self.grid = int(np.ceil(2 / cell_size)) + 1  # cells per axis over [-1, 1]
+        keys = self._cell_keys(self._cells(self.vectors))
+        order = np.argsort(keys, kind="stable")
+        unique_keys, starts = np.unique(keys[order], return_index=True)
+        bounds = np.append(starts, len(order))
+        self.buckets = {int(key): order[bounds[i]:bounds[i + 1]] for i, key in enumerate(unique_keys)}
+
+    @classmethod
+    def from_csv(cls, path, **kwargs):
+        names, latitudes, longitudes, websites = [], [], [], []
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                names.append(row["name"])
+                latitudes.append(float(row["latitude"]))
+                longitudes.append(float(row["longitude"]))
+                websites.append(row.get("website", ""))
+        return cls(names, latitudes, longitudes, websites, **kwargs)
+
+    def __len__(self):
+        return len(self.names)
+
+    def _cells(self, vectors):
+        return np.floor((vectors + 1) / self.cell_size).astype(np.int64)
+
+    def _cell_keys(self, cells):
+        return (cells[..., 0] * self.grid + cells[..., 1]) * self.grid + cells[..., 2]
+
+    def _shell(self, cell, radius):
+        # Indices of resorts in cells exactly `radius` cells away (Chebyshev) from `cell`
+        cells = cell + shell_offsets(radius)
+        cells = cells[((cells >= 0) & (cells < self.grid)).all(axis=1)]
+        found = [self.buckets[key] for key in self._cell_keys(cells).tolist() if key in self.buckets]
+        return np.concatenate(found) if found else np.empty(0, dtype=np.int64)
+
+    def _search(self, lat, lon, enough):
+        """
+        Visit shells around the query until enough(chords, bound) says the
+        answer is settled, where bound is the smallest chord distance any
+        unvisited resort can have. Returns (indices, chord distances).
+        """
+        query = unit_vectors(lat, lon)
+        cell = self._cells(query)
+        indices = np.empty(0, dtype=np.int64)
+        radius = 0
+        while True:
+            # Once a shell would touch more cells than there are resorts, scan everything
+            if (2 * radius + 1) ** 3 > len(self) or radius >= self.grid:
+                indices = np.arange(len(self))
+                chords = np.linalg.norm(self.vectors - query, axis=1)
+                return indices, chords
+            indices = np.concatenate([indices, self._shell(cell, radius)])
+            chords = np.linalg.norm(self.vectors[indices] - query, axis=1)
+            # Anything in an unvisited cell is at least radius * cell_size away
+            if enough(chords, radius * self.cell_size):
+                return indices, chords
+            radius += 1
+
+    def _result(self, lat, lon, indices):
+        distances = haversine_miles(lat, lon, self.latitudes[indices], self.longitudes[indices])
+        order = np.argsort(distances, kind="stable")
+        return indices[order], distances[order]
+
+    def nearest(self, lat, lon, k):
+        """
+        The k nearest resorts as (indices, miles), closest first.
+        """
+        k = min(k, len(self))
+        if k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        indices, chords = self._search(
+            lat, lon, lambda chords, bound: len(chords) >= k and np.partition(chords, k - 1)[k - 1] <= bound
+        )
+        if len(indices) > k:
+            keep = np.argpartition(chords, k - 1)[:k]
+            indices = indices[keep]
+        return self._result(lat, lon, indices)
+
+    def within(self, lat, lon, radius_miles, limit=None):
+        """
+        Resorts within radius_miles as (indices, miles), closest first.
+        """
+        max_chord = 2 * np.sin(min(radius_miles / EARTH_RADIUS_MILES, np.pi) / 2)
+        indices, chords = self._search(lat, lon, lambda chords, bound: max_chord <= bound)
+        indices, distances = self._result(lat, lon, indices[chords <= max_chord + 1e-12])
+        keep = distances <= radius_miles
+        indices, distances = indices[keep], distances[keep]
+        if limit is not None:
+            indices, distances = indices[:limit], distances[:limit]
+        return indices, distances
+
+    def resort(self, i):
+        return {
+            "name": self.names[i],
+            "latitude": float(self.latitudes[i]),
+            "longitude": float(self.longitudes[i]),
+            "website": self.websites[i],
+        }
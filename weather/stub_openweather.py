@@ -0,0 +1,88 @@
+"""
+Local stand-in for the OpenWeatherMap onecall API.
+
+Returns canned weather for any lat/lon so the backend can be run and
+exercised without an API key. Coordinates listed in --fail get a 500,
+--delay adds latency to every response and --slow adds --slow-delay more
+for chosen coordinates, which is handy for checking that slow or failing
+resorts come back as N/A (or stream in last) without holding up the rest.
+
+Usage:
+    python stub_openweather.py --port 8081 --delay 0.5
+    OPENWEATHER_BASE_URL=http://127.0.0.1:8081/data/2.5/onecall python backend.py
+"""
+
+import argparse
+import json
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+def canned_weather(lat, lon):
+    temp = round(30 + (abs(lat) + abs(lon)) % 20, 1)
+    return {
+        "lat": lat,
+        "lon": lon,
+        "current": {"temp": temp, "weather": [{"main": "Snow", "description": "light snow"}]},
+        "daily": [
+            {"temp": {"day": round(temp + i, 1)}, "weather": [{"main": "Snow" if i % 2 == 0 else "Clouds"}]}
+            for i in range(7)
+        ],
+    }
+
+
+def make_handler(delay, fail, slow=(), slow_delay=0.0):
+    class StubHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            query = parse_qs(urlparse(self.path).query)
+            try:
+                lat = float(query["lat"][0])
+                lon = float(query["lon"][0])
+            except (KeyError, ValueError):
+                self.send_error(400, "lat and lon are required")
+                return
+
+            coords = (round(lat, 4), round(lon, 4))
+            time.sleep(delay + (slow_delay if coords in slow else 0.0))
+            if coords in fail:
+                self.send_error(500, "stub failure")
+                return
+
+            body = json.dumps(canned_weather(lat, lon)).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return StubHandler
+
+
+def parse_coords(value):
+    lat, lon = value.split(",")
+    return round(float(lat), 4), round(float(lon), 4)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve canned OpenWeatherMap onecall responses.")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--delay", type=float, default=0.0, help="Seconds to wait before each response.")
+    parser.add_argument("--fail", type=parse_coords, action="append", default=[],
+                        help="lat,lon to answer with a 500 (repeatable).")
+    parser.add_argument("--slow", type=parse_coords, action="append", default=[],
+                        help="lat,lon to answer --slow-delay seconds late (repeatable).")
+    parser.add_argument("--slow-delay", type=float, default=5.0)
+    args = parser.parse_args()
+
+    handler = make_handler(args.delay, set(args.fail), set(args.slow), args.slow_delay)
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), handler)
+    print(f"Stub OpenWeatherMap on http://127.0.0.1:{args.port}/data/2.5/onecall")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Tests for the concurrent weather fetch, run against stub_openweather.py on
+a free local port.
+
+    pytest test_backend.py
+"""
+
+import threading
+import time
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+import backend
+from stub_openweather import make_handler
+from weather_cache import WeatherCache
+
+RESORTS = [
+    {"name": "Alpha", "latitude": 39.6403, "longitude": -106.3742, "website": "https://alpha.example"},
+    {"name": "Bravo", "latitude": 40.4572, "longitude": -106.8045, "website": "https://bravo.example"},
+    {"name": "Charlie", "latitude": 39.1911, "longitude": -106.8175, "website": "https://charlie.example"},
+    {"name": "Delta", "latitude": 44.0582, "longitude": -121.3153, "website": "https://delta.example"},
+]
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    """
+    Start a stub (fail/slow: resorts to answer with a 500 or late) and point
+    the backend at it with an empty cache. Returns the client ports the stub
+    saw, one per TCP connection.
+    """
+    servers = []
+
+    def start(fail=(), slow=(), slow_delay=0.0):
+        ports = set()
+        base = make_handler(0.0, {backend.resort_key(r) for r in fail},
+                            {backend.resort_key(r) for r in slow}, slow_delay)
+
+        class Handler(base):
+            protocol_version = "HTTP/1.1"  # keep-alive, so connection reuse is visible
+
+            def do_GET(self):
+                ports.add(self.client_address[1])
+                super().do_GET()
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+
+        monkeypatch.setattr(backend, "BASE_URL", f"http://127.0.0.1:{server.server_port}/data/2.5/onecall")
+        monkeypatch.setattr(backend, "weather_cache", WeatherCache(backend.load_weather, ttl=60))
+        # Drop connections pooled by earlier tests
+        backend.session.close()
+        return ports
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def test_one_result_per_resort(stub):
+    stub()
+    results = backend.fetch_weather_for_resorts(RESORTS, deadline=5)
+
+    assert len(results) == len(RESORTS)
+    for weather in results:
+        assert weather is not backend.UNAVAILABLE
+        assert weather["current"].startswith("Light snow")
+        assert len(weather["forecast"]) == 5
+
+
+def test_reuses_pooled_session(stub, monkeypatch):
+    ports = stub()
+    calls = []
+    get = backend.session.get
+    monkeypatch.setattr(backend.session, "get", lambda *args, **kwargs: calls.append(args) or get(*args, **kwargs))
+
+    for resort in RESORTS:
+        assert backend.fetch_weather(resort["latitude"], resort["longitude"]) is not backend.UNAVAILABLE
+
+    assert len(calls) == len(RESORTS)
+    # Sequential calls share one kept-alive connection
+    assert len(ports) == 1
+
+
+def test_partial_results_when_upstream_fails_or_is_slow(stub):
+    failing, slow = RESORTS[1], RESORTS[3]
+    stub(fail=[failing], slow=[slow], slow_delay=3.0)
+
+    start = time.perf_counter()
+    results = backend.fetch_weather_for_resorts(RESORTS, deadline=1.0)
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 2.5
+    assert len(results) == len(RESORTS)
+    assert results[1] is backend.UNAVAILABLE
+    assert results[3] is backend.UNAVAILABLE
+    for i in (0, 2):
+        assert results[i] is not backend.UNAVAILABLE
@@ -0,0 +1,130 @@
+"""
+Shared TTL cache for resort weather.
+
+Weather at a resort is the same for every user and changes slowly, so each
+resort is fetched at most once per TTL no matter how many requests come in.
+
+- Single flight: when an entry is missing or expired, the first caller loads
+  it and any concurrent callers for the same key wait for that one result.
+- Refresh ahead: a hit in the last part of an entry's life (past
+  refresh_ahead * ttl) still returns immediately, but schedules a background
+  reload so popular resorts never go cold.
+- Stale on error: if a reload fails, the previous value is served until a
+  later reload succeeds. Failures are remembered for error_ttl so a resort
+  whose upstream is down is not retried on every request.
+- Optional SQLite persistence so a restart does not refetch everything.
+
+The loader returns None for "nothing to cache" (e.g. the API was down).
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+
+
+class WeatherCache:
+    def __init__(self, loader, ttl=900, refresh_ahead=0.8, db_path=None, wait_timeout=15,
+                 error_ttl=60, refresh_workers=4):
+        self.loader = loader
+        self.ttl = ttl
+        self.error_ttl = error_ttl
+        self.refresh_ahead = refresh_ahead
+        self.wait_timeout = wait_timeout
+        self.hits = 0
+        self.misses = 0
+        self.upstream_calls = 0
+        self._entries = {}   # key -> (value, fetched_at)
+        self._inflight = {}  # key -> Future for the load in progress
+        self._failed = {}    # key -> time of the last failed load
+        self._lock = threading.Lock()
+        # Separate from any request pool so queued refreshes can't be starved by waiting requests
+        self._refresher = ThreadPoolExecutor(max_workers=refresh_workers)
+
+        self._db = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS weather (key TEXT PRIMARY KEY, value TEXT NOT NULL, fetched_at REAL NOT NULL)"
+            )
+            self._db.commit()
+            # Keep expired rows too: they are still useful as a stale fallback
+            for key, value, fetched_at in self._db.execute("SELECT key, value, fetched_at FROM weather"):
+                self._entries[tuple(json.loads(key))] = (json.loads(value), fetched_at)
+
+    def get(self, key, block=True):
+        """
+        Return the cached value for key, loading it if needed.
+        With block=False only a fresh value is returned (or None); a missing
+        or expired entry is not loaded.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[1] < self.ttl:
+                self.hits += 1
+                if now - entry[1] >= self.ttl * self.refresh_ahead and key not in self._inflight:
+                    future = self._inflight[key] = Future()
+                    self._refresher.submit(self._load, key, future)
+                return entry[0]
+            if not block:
+                return None
+            stale = entry[0] if entry is not None else None
+            failed_at = self._failed.get(key)
+            if failed_at is not None and now - failed_at < self.error_ttl:
+                return stale
+
+            self.misses += 1
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+
+        if leader:
+            self._load(key, future)
+        try:
+            return future.result(timeout=self.wait_timeout)
+        except FutureTimeout:
+            return stale
+
+    def _load(self, key, future):
+        try:
+            value = self.loader(key)
+        except Exception as e:
+            print(f"Error loading weather for {key}: {e}")
+            value = None
+
+        with self._lock:
+            self.upstream_calls += 1
+            if value is not None:
+                fetched_at = time.time()
+                self._entries[key] = (value, fetched_at)
+                self._failed.pop(key, None)
+                self._persist(key, value, fetched_at)
+            else:
+                self._failed[key] = time.time()
+                # Serve the last good value, however old, rather than nothing
+                entry = self._entries.get(key)
+                value = entry[0] if entry is not None else None
+            del self._inflight[key]
+        future.set_result(value)
+
+    def _persist(self, key, value, fetched_at):
+        if self._db is None:
+            return
+        self._db.execute(
+            "INSERT OR REPLACE INTO weather (key, value, fetched_at) VALUES (?, ?, ?)",
+            (json.dumps(list(key)), json.dumps(value), fetched_at),
+        )
+        self._db.commit()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "upstream_calls": self.upstream_calls,
+            }